@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TodoAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todo_app'
+
+    def ready(self):
+        from todo_app.telemetry import setup_tracing
+        setup_tracing()
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class InMemoryBroker:
+    """
+    Fans todo events out to the WebSocket connections of a single process.
+
+    A broker only needs publish/subscribe/unsubscribe, so this one can be
+    replaced by a client for a local pub/sub server through the
+    TODO_EVENTS_BROKER setting when the backend runs as several processes.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            self._subscribers[user_id].discard(subscriber)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        # Views run in worker threads, so hand the event to each
+        # connection's own event loop.
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue, event):
+        # A client that stops reading doesn't grow memory: once its queue is
+        # full the backlog is replaced by a single todo.resync, and the client
+        # catches up through the change feed cursor instead.
+        if not queue.full():
+            queue.put_nowait(event)
+            return
+
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({'type': 'todo.resync'})
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_path = getattr(settings, 'TODO_EVENTS_BROKER', 'todo_app.events.InMemoryBroker')
+                _broker = import_string(broker_path)()
+    return _broker
+
+
+def publish_todo_event(todo, event_type, data=None):
+    event = {
+        'type': f'todo.{event_type}',
+        'id': todo.pk,
+        'sequence': todo.sequence,
+        'todo': data,
+    }
+    user_id = todo.user_id
+    transaction.on_commit(lambda: get_broker().publish(user_id, event))
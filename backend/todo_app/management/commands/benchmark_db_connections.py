@@ -0,0 +1,116 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from todo_app.models import Todo
+
+# Connection strategies compared by --compare, as environment overrides for
+# the settings in todo_project/settings.py.
+STRATEGIES = {
+    'fresh': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '60'},
+    'pool': {'DB_POOL': '1'},
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-request database cost under concurrent load with the configured '
+        'connection settings, or compare fresh/persistent/pooled connections with --compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent simulated requests.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+        parser.add_argument('--compare', action='store_true',
+                            help='Run each connection strategy in a subprocess and compare them.')
+        parser.add_argument('--json', action='store_true', help='Print the result as JSON.')
+
+    def _request(self):
+        # Same lifecycle as a real request: the request_started/finished
+        # signals are what close, keep or return the connection.
+        request_started.send(sender=BaseHandler)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            Todo.objects.filter(pk=0).exists()
+        finally:
+            request_finished.send(sender=BaseHandler)
+
+    def _worker(self, requests, latencies):
+        for _ in range(requests):
+            started = time.perf_counter()
+            self._request()
+            latencies.append((time.perf_counter() - started) * 1000)
+        connection.close()
+
+    def _measure(self, threads, requests):
+        latencies = []
+        workers = [
+            threading.Thread(target=self._worker, args=(requests, latencies))
+            for _ in range(threads)
+        ]
+
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'mean_ms': statistics.mean(latencies),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+        }
+
+    def _compare(self, threads, requests):
+        results = {}
+        for name, overrides in STRATEGIES.items():
+            output = subprocess.run(
+                [sys.executable, sys.argv[0], 'benchmark_db_connections', '--json',
+                 '--threads', str(threads), '--requests', str(requests)],
+                env={**os.environ, **overrides},
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[name] = json.loads(output)
+        return results
+
+    def handle(self, *args, **options):
+        if not options['compare']:
+            result = self._measure(options['threads'], options['requests'])
+            if options['json']:
+                self.stdout.write(json.dumps(result))
+            else:
+                self._report({settings.DATABASES['default']['ENGINE']: result})
+            return
+
+        results = self._compare(options['threads'], options['requests'])
+        self._report(results, baseline=results['fresh'])
+
+    def _report(self, results, baseline=None):
+        for name, result in results.items():
+            line = (
+                f"{name:<12} {result['throughput']:8.0f} req/s  mean {result['mean_ms']:6.2f} ms  "
+                f"p50 {result['p50_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms"
+            )
+            if baseline and result is not baseline:
+                line += f"  saves {baseline['mean_ms'] - result['mean_ms']:6.2f} ms/request"
+            self.stdout.write(line)
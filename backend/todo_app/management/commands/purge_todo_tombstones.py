@@ -0,0 +1,32 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from todo_app.models import Todo
+
+
+class Command(BaseCommand):
+    help = 'Hard-delete soft-deleted todos past the retention period and raise the change feed cursor floor.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'TODO_TOMBSTONE_RETENTION_DAYS', 30),
+            help='Keep tombstones for this many days.'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Seconds between passes; 0 runs a single pass and exits.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            purged = Todo.purge_tombstones(timezone.now() - timedelta(days=options['days']))
+            self.stdout.write(f'Purged {purged} tombstones older than {options["days"]} days')
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
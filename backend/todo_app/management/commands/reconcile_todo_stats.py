@@ -0,0 +1,41 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from todo_app.models import TodoStats
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-user todo statistics and report counters that had drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Seconds between passes; 0 runs a single pass and exits.'
+        )
+
+    def handle(self, *args, **options):
+        fields = ('notstarted', 'inprogress', 'done', 'blocked')
+
+        while True:
+            drifted = 0
+            users = (
+                User.objects
+                .filter(Q(todos__isnull=False) | Q(todo_stats__isnull=False))
+                .distinct()
+                .values_list('id', flat=True)
+            )
+
+            for user_id in users.iterator():
+                before = TodoStats.objects.filter(user_id=user_id).values(*fields).first()
+                after = TodoStats.reconcile(user_id)
+                if before is not None and before != {field: getattr(after, field) for field in fields}:
+                    drifted += 1
+
+            self.stdout.write(f'Reconciled todo stats, {drifted} users had drifted')
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from todo_app.reminders import scan_due_todos
+
+
+class Command(BaseCommand):
+    help = 'Queue reminders for overdue and due-soon todos and refresh the per-user summaries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Seconds between scans; 0 runs a single scan and exits.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--due-soon-hours', type=int,
+            default=getattr(settings, 'TODO_REMINDER_DUE_SOON_HOURS', 24)
+        )
+
+    def handle(self, *args, **options):
+        due_soon = timedelta(hours=options['due_soon_hours'])
+
+        while True:
+            queued, users = scan_due_todos(due_soon=due_soon, batch_size=options['batch_size'])
+            self.stdout.write(f'Queued {queued} reminders for {users} users')
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
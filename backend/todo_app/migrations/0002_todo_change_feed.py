@@ -0,0 +1,62 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def number_existing_todos(apps, schema_editor):
+    Todo = apps.get_model('todo_app', 'Todo')
+    TodoSequence = apps.get_model('todo_app', 'TodoSequence')
+
+    counters = {}
+    for todo in Todo.objects.order_by('user_id', 'id'):
+        counters[todo.user_id] = counters.get(todo.user_id, 0) + 1
+        Todo.objects.filter(pk=todo.pk).update(sequence=counters[todo.user_id])
+
+    for user_id, value in counters.items():
+        TodoSequence.objects.create(user_id=user_id, value=value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='sequence',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user', 'sequence'], name='todo_user_sequence_idx'),
+        ),
+        migrations.CreateModel(
+            name='TodoSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='todo_sequence', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(number_existing_todos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# The search vector only exists on PostgreSQL; other backends (SQLite in
+# tests) fall back to substring matching in todo_app.search.
+ADD_SEARCH_VECTOR = """
+ALTER TABLE todo_app_todo ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX todo_search_vector_idx ON todo_app_todo USING GIN (search_vector);
+"""
+
+DROP_SEARCH_VECTOR = """
+DROP INDEX IF EXISTS todo_search_vector_idx;
+ALTER TABLE todo_app_todo DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ADD_SEARCH_VECTOR)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_VECTOR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0002_todo_change_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
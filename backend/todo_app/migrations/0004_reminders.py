@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0003_todo_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['status', 'due_date'], name='todo_status_due_date_idx'),
+        ),
+        migrations.CreateModel(
+            name='TodoReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('due_soon', 'Due Soon'), ('overdue', 'Overdue')], max_length=20)),
+                ('due_date', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('todo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='todo_app.todo')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('todo', 'kind', 'due_date'), name='todo_reminder_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReminderSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('overdue_count', models.PositiveIntegerField(default=0)),
+                ('due_soon_count', models.PositiveIntegerField(default=0)),
+                ('items', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0005_todostats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todosequence',
+            name='purged_through',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_app', '0006_todosequence_purged_through'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='todo',
+            name='todo_status_due_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['status', 'due_date', 'id'], name='todo_status_due_date_idx'),
+        ),
+    ]
@@ -1,5 +1,35 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class TodoSequence(models.Model):
+    # Per-user change counter. Every write to a todo takes the next value, so
+    # clients can ask for "everything after sequence N".
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='todo_sequence')
+    value = models.BigIntegerField(default=0)
+    # Highest sequence whose tombstone has been purged; a client holding an
+    # older cursor could miss deletions and has to resync from 0.
+    purged_through = models.BigIntegerField(default=0)
+
+    @classmethod
+    def next_for(cls, user_id):
+        # The row lock is held until the surrounding transaction commits, so
+        # writes for one user commit in sequence order and a cursor never
+        # skips a row that becomes visible later.
+        counter, _ = cls.objects.select_for_update().get_or_create(user_id=user_id)
+        counter.value = F('value') + 1
+        counter.save(update_fields=['value'])
+        counter.refresh_from_db(fields=['value'])
+        return counter.value
+
+
+class TodoManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Todo(models.Model):
@@ -27,5 +57,189 @@ class Todo(models.Model):
         related_name='dependent_tasks'
     )
 
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    sequence = models.BigIntegerField(default=0, editable=False)
+
+    # Soft-deleted rows are hidden from the default manager (and therefore
+    # from user.todos); the change feed reads through all_objects.
+    objects = TodoManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'sequence'], name='todo_user_sequence_idx'),
+            models.Index(fields=['status', 'due_date', 'id'], name='todo_status_due_date_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'sequence', 'updated_at'}
+
+        with transaction.atomic():
+            self.sequence = TodoSequence.next_for(self.user_id)
+            before = TodoStats.snapshot(self.pk) if self.pk else None
+            super().save(*args, **kwargs)
+            TodoStats.record_change(self, before, TodoStats.snapshot(self.pk))
+
+    def delete(self, *args, **kwargs):
+        # Keep a tombstone so delta clients learn about the deletion.
+        with transaction.atomic():
+            for dependent in self.dependent_tasks.all():
+                dependent.dependency = None
+                dependent.save(update_fields=['dependency'])
+
+            self.deleted_at = timezone.now()
+            self.save(update_fields=['deleted_at'])
+
+    def hard_delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
+
+    @classmethod
+    def purge_tombstones(cls, deleted_before):
+        """Hard-delete tombstones older than `deleted_before`, returning how many were removed"""
+        purged = 0
+        users = (
+            cls.all_objects
+            .filter(deleted_at__lt=deleted_before)
+            .values_list('user_id', flat=True)
+            .distinct()
+        )
+
+        for user_id in list(users):
+            with transaction.atomic():
+                # Same lock as save(), so the cursor floor moves together with the rows
+                counter = TodoSequence.objects.select_for_update().get(user_id=user_id)
+                tombstones = cls.all_objects.filter(user_id=user_id, deleted_at__lt=deleted_before)
+                last = tombstones.aggregate(last=models.Max('sequence'))['last']
+                if last is None:
+                    continue
+
+                purged += tombstones.delete()[1].get(cls._meta.label, 0)
+                if last > counter.purged_through:
+                    counter.purged_through = last
+                    counter.save(update_fields=['purged_through'])
+
+        return purged
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+OPEN_STATUSES = ('notstarted', 'inprogress')
+
+
+class TodoStats(models.Model):
+    # Per-user counters kept current by Todo.save() so stats reads are a
+    # single row lookup. `manage.py reconcile_todo_stats` recounts them.
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='todo_stats')
+    notstarted = models.IntegerField(default=0)
+    inprogress = models.IntegerField(default=0)
+    done = models.IntegerField(default=0)
+    # Open todos whose dependency is not done yet
+    blocked = models.IntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    @staticmethod
+    def snapshot(todo_id):
+        row = (
+            Todo.all_objects
+            .filter(pk=todo_id)
+            .values('status', 'deleted_at', 'dependency_id', 'dependency__status')
+            .first()
+        )
+        if row is None or row['deleted_at'] is not None:
+            return None
+
+        blocked = (
+            row['status'] in OPEN_STATUSES
+            and row['dependency_id'] is not None
+            and row['dependency__status'] != 'done'
+        )
+        return row['status'], blocked
+
+    @classmethod
+    def record_change(cls, todo, before, after):
+        deltas = defaultdict(Counter)
+
+        if before:
+            deltas[todo.user_id][before[0]] -= 1
+            deltas[todo.user_id]['blocked'] -= before[1]
+        if after:
+            deltas[todo.user_id][after[0]] += 1
+            deltas[todo.user_id]['blocked'] += after[1]
+
+        # Finishing (or reopening) a todo unblocks (or blocks) the open todos
+        # that depend on it. Deleted todos have no dependents left, see delete().
+        if before and after and (before[0] == 'done') != (after[0] == 'done'):
+            dependents = (
+                Todo.objects
+                .filter(dependency_id=todo.pk, status__in=OPEN_STATUSES)
+                .values('user_id')
+                .annotate(count=Count('id'))
+            )
+            sign = -1 if after[0] == 'done' else 1
+            for row in dependents:
+                deltas[row['user_id']]['blocked'] += sign * row['count']
+
+        for user_id, counter in deltas.items():
+            changes = {field: F(field) + delta for field, delta in counter.items() if delta}
+            if not changes:
+                continue
+            if not cls.objects.filter(user_id=user_id).update(**changes):
+                cls.reconcile(user_id)
+
+    @classmethod
+    def reconcile(cls, user_id):
+        with transaction.atomic():
+            # Same lock as Todo.save(), so no write lands mid-recount
+            TodoSequence.objects.select_for_update().filter(user_id=user_id).first()
+
+            todos = Todo.objects.filter(user_id=user_id)
+            counts = dict(todos.values_list('status').annotate(count=Count('id')))
+            blocked = (
+                todos
+                .filter(status__in=OPEN_STATUSES, dependency__isnull=False)
+                .exclude(dependency__status='done')
+                .count()
+            )
+
+            stats, _ = cls.objects.update_or_create(user_id=user_id, defaults={
+                'notstarted': counts.get('notstarted', 0),
+                'inprogress': counts.get('inprogress', 0),
+                'done': counts.get('done', 0),
+                'blocked': blocked,
+                'reconciled_at': timezone.now(),
+            })
+        return stats
+
+
+class TodoReminder(models.Model):
+    # One row per notification sent, so the scheduler does not repeat itself.
+    # Moving the due date makes the todo eligible again.
+    KIND_CHOICES = (
+        ('due_soon', 'Due Soon'),
+        ('overdue', 'Overdue'),
+    )
+
+    todo = models.ForeignKey(Todo, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    due_date = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['todo', 'kind', 'due_date'], name='todo_reminder_unique'),
+        ]
+
+
+class ReminderSummary(models.Model):
+    # Rebuilt by each scheduler run; lets clients ask "what's overdue"
+    # without pulling and filtering the full list.
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='reminder_summary')
+    overdue_count = models.PositiveIntegerField(default=0)
+    due_soon_count = models.PositiveIntegerField(default=0)
+    items = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
@@ -0,0 +1,133 @@
+import heapq
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from todo_app.events import get_broker
+from todo_app.models import OPEN_STATUSES, ReminderSummary, Todo, TodoReminder
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ITEMS = 20
+
+
+class LogSink:
+    def send(self, notifications):
+        for notification in notifications:
+            logger.info(
+                'Reminder for user %s: %s "%s" due %s',
+                notification['user_id'], notification['kind'],
+                notification['title'], notification['due_date']
+            )
+
+
+class BrokerSink:
+    # Pushes reminders to the user's WebSocket connections. The scheduler is
+    # its own process, so this needs a TODO_EVENTS_BROKER that crosses
+    # processes; the in-memory broker would drop everything.
+    def send(self, notifications):
+        broker = get_broker()
+        for notification in notifications:
+            broker.publish(notification['user_id'], {'type': 'todo.reminder', **notification})
+
+
+def get_sink():
+    return import_string(getattr(settings, 'TODO_REMINDER_SINK', 'todo_app.reminders.LogSink'))()
+
+
+def _due_batches(horizon, batch_size):
+    # One walk per open status, in (status, due_date, id) order, which is the
+    # order of todo_status_due_date_idx. Each keyset page is then a single
+    # bounded range scan of that index instead of a sort of every due row.
+    for status in OPEN_STATUSES:
+        todos = (
+            Todo.objects
+            .filter(status=status, due_date__lte=horizon)
+            .only('id', 'user_id', 'title', 'due_date')
+            .order_by('status', 'due_date', 'id')
+        )
+
+        batch = list(todos[:batch_size])
+        while batch:
+            yield batch
+            last = batch[-1]
+            batch = list(
+                todos
+                .filter(due_date__gte=last.due_date)
+                .filter(Q(due_date__gt=last.due_date) | Q(due_date=last.due_date, id__gt=last.id))[:batch_size]
+            )
+
+
+def scan_due_todos(now=None, due_soon=timedelta(hours=24), batch_size=500, sink=None):
+    now = now or timezone.now()
+    sink = sink or get_sink()
+
+    summaries = defaultdict(lambda: {'overdue_count': 0, 'due_soon_count': 0, 'items': []})
+    # Per user, the SUMMARY_ITEMS earliest due todos as a max-heap on due date;
+    # the batches come one status at a time, not in global due order.
+    earliest = defaultdict(list)
+    queued = 0
+
+    for batch in _due_batches(now + due_soon, batch_size):
+        already_sent = set(
+            TodoReminder.objects
+            .filter(todo_id__in=[todo.id for todo in batch])
+            .values_list('todo_id', 'kind', 'due_date')
+        )
+
+        notifications = []
+        reminders = []
+        for todo in batch:
+            kind = 'overdue' if todo.due_date <= now else 'due_soon'
+
+            summary = summaries[todo.user_id]
+            summary[f'{kind}_count'] += 1
+            entry = (-todo.due_date.timestamp(), -todo.id, {
+                'id': todo.id,
+                'title': todo.title,
+                'due_date': todo.due_date.isoformat(),
+                'overdue': kind == 'overdue',
+            })
+            if len(earliest[todo.user_id]) < SUMMARY_ITEMS:
+                heapq.heappush(earliest[todo.user_id], entry)
+            else:
+                heapq.heappushpop(earliest[todo.user_id], entry)
+
+            if (todo.id, kind, todo.due_date) in already_sent:
+                continue
+
+            notifications.append({
+                'user_id': todo.user_id,
+                'todo_id': todo.id,
+                'title': todo.title,
+                'kind': kind,
+                'due_date': todo.due_date.isoformat(),
+            })
+            reminders.append(TodoReminder(todo_id=todo.id, kind=kind, due_date=todo.due_date))
+
+        if notifications:
+            # Record only after the sink accepted them: at-least-once delivery.
+            sink.send(notifications)
+            TodoReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+            queued += len(notifications)
+
+    for user_id, entries in earliest.items():
+        summaries[user_id]['items'] = [item for _, _, item in sorted(entries, reverse=True)]
+
+    ReminderSummary.objects.bulk_create(
+        [ReminderSummary(user_id=user_id, computed_at=now, **summary) for user_id, summary in summaries.items()],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['overdue_count', 'due_soon_count', 'items', 'computed_at'],
+    )
+    # Users with nothing due in this run drop back to zero.
+    ReminderSummary.objects.exclude(computed_at=now).update(
+        overdue_count=0, due_soon_count=0, items=[], computed_at=now
+    )
+
+    return queued, len(summaries)
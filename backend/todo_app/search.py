@@ -0,0 +1,75 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from todo_app.models import Todo
+
+SEARCH_CONFIG = 'english'
+MIN_TERM_LENGTH = 3
+# Dropped by the 'english' config on PostgreSQL; the fallback drops them too
+# so "the" does not match "mother" and "weather".
+STOP_WORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'into', 'about',
+    'are', 'was', 'were', 'has', 'have', 'had', 'not', 'but', 'its', 'our',
+    'your', 'you', 'all', 'any', 'one', 'out',
+}
+
+
+def _search_terms(query):
+    return [
+        term.lower() for term in re.findall(r'\w+', query)
+        if len(term) >= MIN_TERM_LENGTH and term.lower() not in STOP_WORDS
+    ]
+
+
+def _postgres_search(queryset, terms, limit, match_all):
+    # Prefix match, so "rep" finds "report". With match_all every term has to
+    # match, otherwise any may; ts_rank puts rows that match more terms, and
+    # match them in the title, first.
+    tsquery = (' & ' if match_all else ' | ').join(f'{term}:*' for term in terms)
+    column = f'{Todo._meta.db_table}.search_vector'
+    to_tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+
+    return list(
+        queryset
+        .filter(RawSQL(f'{column} @@ {to_tsquery}', [tsquery], output_field=BooleanField()))
+        .annotate(rank=RawSQL(f'ts_rank({column}, {to_tsquery})', [tsquery], output_field=FloatField()))
+        .order_by('-rank', 'id')[:limit]
+    )
+
+
+def _fallback_search(queryset, terms, limit, match_all):
+    # Used on SQLite (tests, local runs): word-prefix matching scored in Python,
+    # title hits weighted like the 'A' weight of the PostgreSQL vector.
+    matches = Q()
+    for term in terms:
+        matches |= Q(title__icontains=term) | Q(description__icontains=term)
+
+    patterns = [re.compile(rf'\b{re.escape(term)}', re.IGNORECASE) for term in terms]
+
+    scored = []
+    for todo in queryset.filter(matches):
+        title_hits = [bool(pattern.search(todo.title)) for pattern in patterns]
+        description_hits = [bool(pattern.search(todo.description or '')) for pattern in patterns]
+        hits = [in_title or in_description for in_title, in_description in zip(title_hits, description_hits)]
+        if not (all(hits) if match_all else any(hits)):
+            continue
+
+        todo.rank = 2 * sum(title_hits) + sum(description_hits)
+        scored.append(todo)
+
+    scored.sort(key=lambda todo: (-todo.rank, todo.id))
+    return scored[:limit]
+
+
+def search_todos(queryset, query, limit=10, match_all=False):
+    terms = _search_terms(query)
+    if not terms:
+        return []
+
+    if connection.vendor == 'postgresql':
+        return _postgres_search(queryset, terms, limit, match_all)
+
+    return _fallback_search(queryset, terms, limit, match_all)
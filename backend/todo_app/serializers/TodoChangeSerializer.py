@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from todo_app.models import Todo
+
+
+class TodoChangeSerializer(serializers.ModelSerializer):
+    deleted = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Todo
+        fields = ('id', 'title', 'description', 'status', 'dependency', 'due_date',
+                  'updated_at', 'sequence', 'deleted')
+        read_only_fields = fields
+
+    def get_deleted(self, obj):
+        return obj.deleted_at is not None
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from todo_app.events import get_broker
+
+UNAUTHORIZED_CLOSE_CODE = 4401
+AUTH_TIMEOUT = 10
+
+
+async def _receive_token(receive):
+    # Browsers can't set headers on a WebSocket handshake, and a token in the
+    # query string ends up in server and proxy access logs. So the client
+    # sends {"type": "auth", "token": "<access>"} as its first message.
+    try:
+        message = await asyncio.wait_for(receive(), AUTH_TIMEOUT)
+    except asyncio.TimeoutError:
+        return None, False
+
+    if message['type'] == 'websocket.disconnect':
+        return None, True
+
+    try:
+        data = json.loads(message.get('text') or '')
+    except ValueError:
+        return None, False
+
+    if not isinstance(data, dict) or data.get('type') != 'auth':
+        return None, False
+    return data.get('token'), False
+
+
+async def _authenticate(token):
+    if not isinstance(token, str):
+        return None
+
+    try:
+        access = AccessToken(token)
+    except TokenError:
+        return None
+
+    # Same user checks as JWTAuthentication: the account must still exist
+    # and be active.
+    user_id = access.get(api_settings.USER_ID_CLAIM)
+    active = await User.objects.filter(
+        **{api_settings.USER_ID_FIELD: user_id}, is_active=True
+    ).aexists()
+
+    return user_id if active else None
+
+
+async def todo_events_socket(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    await send({'type': 'websocket.accept'})
+
+    token, disconnected = await _receive_token(receive)
+    if disconnected:
+        return
+
+    user_id = await _authenticate(token)
+    if user_id is None:
+        await send({'type': 'websocket.close', 'code': UNAUTHORIZED_CLOSE_CODE})
+        return
+
+    broker = get_broker()
+    subscriber = broker.subscribe(user_id)
+    _, queue = subscriber
+
+    next_message = asyncio.ensure_future(receive())
+    next_event = asyncio.ensure_future(queue.get())
+    try:
+        # Sent once subscribed, so a client that catches up through the
+        # change feed from here on can't miss an event.
+        await send({'type': 'websocket.send', 'text': json.dumps({'type': 'auth.ok'})})
+
+        while True:
+            done, _ = await asyncio.wait(
+                {next_message, next_event},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if next_event in done:
+                await send({'type': 'websocket.send', 'text': json.dumps(next_event.result())})
+                next_event = asyncio.ensure_future(queue.get())
+
+            if next_message in done:
+                # The channel is push-only; anything the client sends is ignored.
+                if next_message.result()['type'] == 'websocket.disconnect':
+                    break
+                next_message = asyncio.ensure_future(receive())
+    finally:
+        next_event.cancel()
+        next_message.cancel()
+        broker.unsubscribe(user_id, subscriber)
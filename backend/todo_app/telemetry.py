@@ -0,0 +1,97 @@
+import os
+import time
+
+from django.db import connection
+from django.http import HttpResponse
+from opentelemetry import propagate, trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+
+tracer = trace.get_tracer('todo_app')
+
+REQUEST_LATENCY = Histogram(
+    'todo_http_request_duration_seconds',
+    'Latency of Django requests by view',
+    ['view', 'method', 'status'],
+)
+DB_QUERIES = Histogram(
+    'todo_db_queries_per_request',
+    'Database queries executed per request by view',
+    ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+DB_QUERY_LATENCY = Histogram(
+    'todo_db_query_duration_seconds',
+    'Latency of individual database queries',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+def setup_tracing(service_name='todo-backend'):
+    # Spans go to a local collector over OTLP/HTTP when
+    # OTEL_EXPORTER_OTLP_ENDPOINT is set (e.g. http://localhost:4318).
+    provider = TracerProvider(resource=Resource.create({'service.name': service_name}))
+    if os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT'):
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            DB_QUERY_LATENCY.observe(time.perf_counter() - started)
+
+
+class TelemetryMiddleware:
+    # One server span per request, continuing the caller's trace from the
+    # traceparent header, plus latency and query-count histograms per view.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == '/metrics':
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        queries = QueryCounter()
+
+        with tracer.start_as_current_span(
+            f'{request.method} {request.path}',
+            context=propagate.extract(request.headers),
+            kind=trace.SpanKind.SERVER,
+        ) as span:
+            request.telemetry_view = 'unresolved'
+            with connection.execute_wrapper(queries):
+                response = self.get_response(request)
+
+            span.set_attribute('http.method', request.method)
+            span.set_attribute('http.status_code', response.status_code)
+            span.set_attribute('db.query_count', queries.count)
+
+        view = request.telemetry_view
+        REQUEST_LATENCY.labels(view=view, method=request.method, status=response.status_code).observe(
+            time.perf_counter() - started
+        )
+        DB_QUERIES.labels(view=view).observe(queries.count)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        request.telemetry_view = view_class.__name__ if view_class else view_func.__name__
+        trace.get_current_span().update_name(f'{request.method} {request.telemetry_view}')
+
+
+def metrics_view(request):
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
@@ -1,3 +1,401 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from todo_app.models import ReminderSummary, Todo, TodoReminder, TodoStats
+from todo_app.reminders import SUMMARY_ITEMS, scan_due_todos
+
+STATS_FIELDS = ('notstarted', 'inprogress', 'done', 'blocked')
+
+
+class TodoStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('stats', password='password-123')
+
+    def counters(self):
+        return TodoStats.objects.filter(user=self.user).values(*STATS_FIELDS).first()
+
+    def assertCountersMatchRecount(self, **expected):
+        counters = self.counters()
+        stats = TodoStats.reconcile(self.user.id)
+        self.assertEqual(counters, {field: getattr(stats, field) for field in STATS_FIELDS})
+        if expected:
+            self.assertEqual({field: counters[field] for field in expected}, expected)
+
+    def create(self, title, **fields):
+        return Todo.objects.create(user=self.user, title=title, **fields)
+
+    def set_status(self, todo, status):
+        todo.status = status
+        todo.save()
+
+    def test_status_changes(self):
+        todo = self.create('write report')
+        self.assertCountersMatchRecount(notstarted=1, inprogress=0, done=0)
+
+        self.set_status(todo, 'inprogress')
+        self.assertCountersMatchRecount(notstarted=0, inprogress=1, done=0)
+
+        self.set_status(todo, 'done')
+        self.assertCountersMatchRecount(notstarted=0, inprogress=0, done=1)
+
+        self.set_status(todo, 'notstarted')
+        self.assertCountersMatchRecount(notstarted=1, inprogress=0, done=0)
+
+    def test_soft_delete_removes_todo_from_counts(self):
+        self.create('keep')
+        todo = self.create('drop', status='inprogress')
+
+        todo.delete()
+        self.assertCountersMatchRecount(notstarted=1, inprogress=0, blocked=0)
+
+        # Saving a tombstone again must not bring it back
+        todo.save()
+        self.assertCountersMatchRecount(notstarted=1, inprogress=0, blocked=0)
+
+    def test_dependents_block_and_unblock_with_their_dependency(self):
+        dependency = self.create('design')
+        first = self.create('build', dependency=dependency)
+        second = self.create('ship', dependency=dependency, status='inprogress')
+        self.assertCountersMatchRecount(blocked=2)
+
+        self.set_status(dependency, 'done')
+        self.assertCountersMatchRecount(blocked=0)
+
+        self.set_status(dependency, 'inprogress')
+        self.assertCountersMatchRecount(blocked=2)
+
+        self.set_status(first, 'done')
+        self.assertCountersMatchRecount(blocked=1)
+
+        self.set_status(second, 'done')
+        self.assertCountersMatchRecount(blocked=0)
+
+        self.set_status(second, 'notstarted')
+        self.assertCountersMatchRecount(blocked=1)
+
+    def test_changing_dependency(self):
+        done = self.create('done already', status='done')
+        pending = self.create('pending')
+        todo = self.create('follow up', dependency=done)
+        self.assertCountersMatchRecount(blocked=0)
+
+        todo.dependency = pending
+        todo.save()
+        self.assertCountersMatchRecount(blocked=1)
+
+        todo.dependency = None
+        todo.save()
+        self.assertCountersMatchRecount(blocked=0)
+
+    def test_deleting_dependency_unblocks_dependents(self):
+        dependency = self.create('design')
+        dependent = self.create('build', dependency=dependency)
+        self.assertCountersMatchRecount(notstarted=2, blocked=1)
+
+        dependency.delete()
+        self.assertCountersMatchRecount(notstarted=1, blocked=0)
+
+        dependent.refresh_from_db()
+        self.assertIsNone(dependent.dependency_id)
+
+    def test_deleting_blocked_todo(self):
+        dependency = self.create('design')
+        dependent = self.create('build', dependency=dependency)
+
+        dependent.delete()
+        self.assertCountersMatchRecount(notstarted=1, blocked=0)
+
+    def test_counters_survive_a_missing_stats_row(self):
+        self.create('first')
+        TodoStats.objects.filter(user=self.user).delete()
+
+        self.create('second')
+        self.assertCountersMatchRecount(notstarted=2)
+
+
+class TodoChangeFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('feed', password='password-123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, title, **fields):
+        return Todo.objects.create(user=self.user, title=title, **fields)
+
+    def changes(self, since, **params):
+        response = self.client.get('/api/todos/changes/', {'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_sequence_increases_with_every_write(self):
+        todo = self.create('first')
+        other = self.create('second')
+        self.assertEqual((todo.sequence, other.sequence), (1, 2))
+
+        todo.status = 'inprogress'
+        todo.save()
+        self.assertEqual(todo.sequence, 3)
+
+        todo.delete()
+        self.assertEqual(Todo.all_objects.get(pk=todo.pk).sequence, 4)
+
+    def test_sequences_are_per_user(self):
+        self.create('mine')
+        other_user = User.objects.create_user('other', password='password-123')
+        theirs = Todo.objects.create(user=other_user, title='theirs')
+
+        self.assertEqual(theirs.sequence, 1)
+        self.assertEqual([change['title'] for change in self.changes(0)['changes']], ['mine'])
+
+    def test_returns_exactly_the_rows_changed_since_the_cursor(self):
+        unchanged = self.create('unchanged')
+        updated = self.create('updated')
+        deleted = self.create('deleted')
+        cursor = self.changes(0)['cursor']
+
+        updated.status = 'done'
+        updated.save()
+        deleted.delete()
+        added = self.create('added')
+
+        page = self.changes(cursor)
+        self.assertEqual(
+            [(change['id'], change['deleted']) for change in page['changes']],
+            [(updated.pk, False), (deleted.pk, True), (added.pk, False)]
+        )
+        self.assertNotIn(unchanged.pk, [change['id'] for change in page['changes']])
+        self.assertEqual(page['cursor'], added.sequence)
+        self.assertFalse(page['has_more'])
+
+        self.assertEqual(self.changes(page['cursor'])['changes'], [])
+
+    def test_full_sync_skips_tombstones_but_moves_past_them(self):
+        kept = self.create('kept')
+        deleted = self.create('deleted')
+        deleted.delete()
+
+        page = self.changes(0)
+        self.assertEqual([change['id'] for change in page['changes']], [kept.pk])
+        self.assertEqual(page['cursor'], Todo.all_objects.get(pk=deleted.pk).sequence)
+
+    def test_pages_follow_the_cursor(self):
+        todos = [self.create(f'todo {index}') for index in range(5)]
+        cursor = self.changes(0)['cursor']
+        for todo in todos:
+            todo.status = 'inprogress'
+            todo.save()
+
+        seen = []
+        while True:
+            page = self.changes(cursor, limit=2)
+            seen += [change['id'] for change in page['changes']]
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+
+        self.assertEqual(seen, [todo.pk for todo in todos])
+
+    def test_cursor_before_purged_tombstones_is_gone(self):
+        self.create('kept')
+        old = self.create('old')
+        cursor = self.changes(0)['cursor']
+
+        old.delete()
+        Todo.all_objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=60))
+        recent = self.create('recent')
+        recent.delete()
+
+        self.assertEqual(Todo.purge_tombstones(timezone.now() - timedelta(days=30)), 1)
+        self.assertFalse(Todo.all_objects.filter(pk=old.pk).exists())
+        self.assertTrue(Todo.all_objects.filter(pk=recent.pk).exists())
+
+        response = self.client.get('/api/todos/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, 410)
+
+        page = self.changes(0)
+        self.assertEqual([change['title'] for change in page['changes']], ['kept'])
+        self.assertEqual(self.changes(page['cursor'])['changes'], [])
+
+
+class TodoSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('search', password='password-123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, title, user=None, **fields):
+        return Todo.objects.create(user=user or self.user, title=title, **fields)
+
+    def search(self, query, **params):
+        response = self.client.get('/api/todos/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [todo['title'] for todo in response.json()['todo']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.create('Call the plumber', description='about the report')
+        self.create('Quarterly report')
+        self.create('Report draft', description='finish the report')
+
+        self.assertEqual(self.search('report'), ['Report draft', 'Quarterly report', 'Call the plumber'])
+
+    def test_matches_word_prefixes_not_substrings(self):
+        self.create('Write report')
+        self.create('Support ticket')
+
+        self.assertEqual(self.search('rep'), ['Write report'])
+        self.assertEqual(self.search('port'), [])
+
+    def test_stop_words_are_ignored(self):
+        self.create('Call mother')
+        self.create('Check the weather')
+
+        self.assertEqual(self.search('the'), [])
+        self.assertEqual(self.search('the mother'), ['Call mother'])
+
+    def test_short_or_empty_queries(self):
+        self.create('Go to gym')
+
+        self.assertEqual(self.search('go to'), [])
+        response = self.client.get('/api/todos/search/', {'q': '  '})
+        self.assertEqual(response.status_code, 400)
+
+    def test_match_all_requires_every_term(self):
+        self.create('Buy shoes')
+        self.create('Buy bread')
+        self.create('Bake bread')
+
+        self.assertEqual(sorted(self.search('buy bread')), ['Bake bread', 'Buy bread', 'Buy shoes'])
+        self.assertEqual(self.search('buy bread', match='all'), ['Buy bread'])
+        self.assertEqual(self.search('buy milk', match='all'), [])
+
+    def test_status_filter(self):
+        self.create('Report open')
+        self.create('Report started', status='inprogress')
+        self.create('Report finished', status='done')
+
+        self.assertEqual(len(self.search('report')), 3)
+        self.assertEqual(
+            sorted(self.search('report', status='notstarted,inprogress')),
+            ['Report open', 'Report started']
+        )
+        self.assertEqual(self.search('report', status='done'), ['Report finished'])
+
+    def test_limit(self):
+        for index in range(5):
+            self.create(f'Report {index}')
+
+        self.assertEqual(len(self.search('report', limit=2)), 2)
+
+    def test_only_own_live_todos(self):
+        other_user = User.objects.create_user('other', password='password-123')
+        self.create('Report for someone else', user=other_user)
+        self.create('My report')
+        self.create('Deleted report').delete()
+
+        self.assertEqual(self.search('report'), ['My report'])
+
+
+class RecordingSink:
+    def __init__(self):
+        self.notifications = []
+
+    def send(self, notifications):
+        self.notifications.extend(notifications)
+
+
+class ReminderScanTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reminders', password='password-123')
+        self.now = timezone.now().replace(microsecond=0)
+        self.sink = RecordingSink()
+
+    def create(self, title, due_in, user=None, **fields):
+        return Todo.objects.create(user=user or self.user, title=title, due_date=self.now + due_in, **fields)
+
+    def scan(self, now=None, batch_size=500):
+        return scan_due_todos(now=now or self.now, due_soon=timedelta(hours=24), batch_size=batch_size, sink=self.sink)
+
+    def sent(self):
+        return sorted((notification['title'], notification['kind']) for notification in self.sink.notifications)
+
+    def test_overdue_and_due_soon_split_at_now(self):
+        self.create('late', -timedelta(hours=1))
+        self.create('due now', timedelta(0))
+        self.create('tomorrow', timedelta(hours=12))
+        self.create('next week', timedelta(days=7))
+        self.create('finished', -timedelta(hours=1), status='done')
+        self.create('started', timedelta(hours=1), status='inprogress')
+
+        self.assertEqual(self.scan(), (4, 1))
+        self.assertEqual(self.sent(), [
+            ('due now', 'overdue'), ('late', 'overdue'),
+            ('started', 'due_soon'), ('tomorrow', 'due_soon'),
+        ])
+
+        summary = ReminderSummary.objects.get(user=self.user)
+        self.assertEqual((summary.overdue_count, summary.due_soon_count), (2, 2))
+        self.assertEqual(
+            [item['title'] for item in summary.items],
+            ['late', 'due now', 'started', 'tomorrow']
+        )
+
+    def test_reminders_are_sent_once_per_kind_and_due_date(self):
+        todo = self.create('report', timedelta(hours=2))
+
+        self.assertEqual(self.scan()[0], 1)
+        self.assertEqual(self.scan()[0], 0)
+
+        # Once it is overdue it gets an overdue reminder, once
+        later = self.now + timedelta(hours=3)
+        self.assertEqual(self.scan(now=later)[0], 1)
+        self.assertEqual(self.scan(now=later)[0], 0)
+
+        # Moving the due date makes it eligible again
+        todo.due_date = later + timedelta(hours=5)
+        todo.save()
+        self.assertEqual(self.scan(now=later)[0], 1)
+
+        self.assertEqual(self.sent(), [('report', 'due_soon'), ('report', 'due_soon'), ('report', 'overdue')])
+        self.assertEqual(TodoReminder.objects.filter(todo=todo).count(), 3)
+
+    def test_batches_cover_every_row_once_with_tied_due_dates(self):
+        other_user = User.objects.create_user('other', password='password-123')
+        for index in range(7):
+            self.create(f'tied {index}', -timedelta(hours=1), status='inprogress' if index % 2 else 'notstarted')
+        for index in range(4):
+            self.create(f'theirs {index}', timedelta(hours=index), user=other_user)
+
+        self.assertEqual(self.scan(batch_size=2), (11, 2))
+        self.assertEqual(len(self.sent()), 11)
+        self.assertEqual(len(set(self.sent())), 11)
+
+        self.assertEqual(ReminderSummary.objects.get(user=self.user).overdue_count, 7)
+        self.assertEqual(ReminderSummary.objects.get(user=other_user).overdue_count, 1)
+        self.assertEqual(ReminderSummary.objects.get(user=other_user).due_soon_count, 3)
+
+    def test_summary_keeps_the_earliest_due_items(self):
+        for index in range(SUMMARY_ITEMS + 5):
+            self.create(f'todo {index}', timedelta(minutes=index + 1), status='inprogress' if index % 3 else 'notstarted')
+
+        self.scan(batch_size=4)
+
+        summary = ReminderSummary.objects.get(user=self.user)
+        self.assertEqual(summary.due_soon_count, SUMMARY_ITEMS + 5)
+        self.assertEqual([item['title'] for item in summary.items], [f'todo {index}' for index in range(SUMMARY_ITEMS)])
+
+    def test_summary_drops_back_to_zero_when_nothing_is_due(self):
+        todo = self.create('late', -timedelta(hours=1))
+        self.scan()
+
+        todo.status = 'done'
+        todo.save()
+        later = self.now + timedelta(minutes=5)
+        self.assertEqual(self.scan(now=later), (0, 0))
 
-# Create your tests here.
+        summary = ReminderSummary.objects.get(user=self.user)
+        self.assertEqual((summary.overdue_count, summary.due_soon_count, summary.items), (0, 0, []))
+        self.assertEqual(summary.computed_at, later)
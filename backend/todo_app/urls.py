@@ -1,7 +1,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from todo_app.views import RegisterView, LoginView, LogoutView, TodoIndexView, TodoDetailView, TodoByTitleView, getUser
+from todo_app.views import RegisterView, LoginView, LogoutView, TodoIndexView, TodoChangesView, TodoSearchView, TodoOverdueView, TodoStatsView, TodoDetailView, TodoByTitleView, getUser
 
 urlpatterns = [
     # User Auth Endpoints
@@ -14,6 +14,14 @@ urlpatterns = [
     # To Do Endpoints
     path('todos/', TodoIndexView.as_view(), name='todo_list'),
 
+    path('todos/changes/', TodoChangesView.as_view(), name='todo_changes'),
+
+    path('todos/search/', TodoSearchView.as_view(), name='todo_search'),
+
+    path('todos/overdue/', TodoOverdueView.as_view(), name='todo_overdue'),
+
+    path('todos/stats/', TodoStatsView.as_view(), name='todo_stats'),
+
     path('todo/', TodoDetailView.as_view(), name='todo_create'),
 
     path('todo/<int:pk>/', TodoDetailView.as_view(), name='todo_detail'),
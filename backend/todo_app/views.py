@@ -8,7 +8,10 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 
-from todo_app.models import Todo
+from todo_app.events import publish_todo_event
+from todo_app.models import ReminderSummary, Todo, TodoSequence, TodoStats
+from todo_app.search import search_todos
+from todo_app.serializers.TodoChangeSerializer import TodoChangeSerializer
 from todo_app.serializers.TodoSerializer import TodoSerializer
 from todo_app.serializers.UserSerializer import UserSerializer
 
@@ -85,6 +88,16 @@ class LogoutView(APIView):
 
             return Response({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
 
+def _delete_and_publish(todo):
+    # delete() detaches the todos that depended on this one; boards need an
+    # update for each of them as well as the deletion itself.
+    dependent_ids = list(todo.dependent_tasks.values_list('id', flat=True))
+    todo.delete()
+    publish_todo_event(todo, 'deleted')
+
+    for dependent in Todo.objects.filter(pk__in=dependent_ids):
+        publish_todo_event(dependent, 'updated', TodoSerializer(dependent).data)
+
 class TodoIndexView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -96,6 +109,132 @@ class TodoIndexView(APIView):
 
         return Response({'todo': tasks.data}, status.HTTP_200_OK)
 
+class TodoChangesView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'error': 'since and limit must be integers'}, status.HTTP_400_BAD_REQUEST)
+
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        value, purged_through = (
+            TodoSequence.objects
+            .filter(user=request.user)
+            .values_list('value', 'purged_through')
+            .first()
+        ) or (0, 0)
+
+        if since == 0:
+            # A full sync has nothing to remove, so it gets the live todos in
+            # one page and a cursor past every tombstone, purged or not.
+            changes = list(request.user.todos.order_by('sequence'))
+            return Response({
+                'changes': TodoChangeSerializer(changes, many=True).data,
+                'cursor': max([value] + [todo.sequence for todo in changes[-1:]]),
+                'has_more': False
+            }, status.HTTP_200_OK)
+
+        if since < purged_through:
+            return Response({
+                'error': 'Cursor is older than the retained change history, resync from since=0',
+                'min_cursor': purged_through
+            }, status.HTTP_410_GONE)
+
+        changes = list(
+            Todo.all_objects
+            .filter(user=request.user, sequence__gt=since)
+            .order_by('sequence')[:limit + 1]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        cursor = changes[-1].sequence if changes else since
+
+        return Response({
+            'changes': TodoChangeSerializer(changes, many=True).data,
+            'cursor': cursor,
+            'has_more': has_more
+        }, status.HTTP_200_OK)
+
+class TodoSearchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Missing search query'}, status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status.HTTP_400_BAD_REQUEST)
+
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        todos = request.user.todos.all()
+        statuses = [value for value in request.query_params.get('status', '').split(',') if value]
+        if statuses:
+            todos = todos.filter(status__in=statuses)
+
+        todos = search_todos(todos, query, limit, match_all=request.query_params.get('match') == 'all')
+        tasks = TodoSerializer(todos, many=True)
+
+        return Response({'todo': tasks.data}, status.HTTP_200_OK)
+
+class TodoOverdueView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        summary = ReminderSummary.objects.filter(user=request.user).first()
+
+        if summary is None:
+            return Response({'overdue_count': 0, 'due_soon_count': 0, 'items': [], 'computed_at': None},
+                            status.HTTP_200_OK)
+
+        return Response({
+            'overdue_count': summary.overdue_count,
+            'due_soon_count': summary.due_soon_count,
+            'items': summary.items,
+            'computed_at': summary.computed_at
+        }, status.HTTP_200_OK)
+
+class TodoStatsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        stats = TodoStats.objects.filter(user=request.user).first()
+        if stats is None:
+            stats = TodoStats.reconcile(request.user.id)
+
+        # Overdue depends on the clock, so it comes from the reminder
+        # scheduler's summary rather than from the write-time counters.
+        summary = ReminderSummary.objects.filter(user=request.user).first()
+
+        total = stats.notstarted + stats.inprogress + stats.done
+
+        return Response({'stats': {
+            'total': total,
+            'notstarted': stats.notstarted,
+            'inprogress': stats.inprogress,
+            'done': stats.done,
+            'open': stats.notstarted + stats.inprogress,
+            'blocked': stats.blocked,
+            'overdue': summary.overdue_count if summary else 0,
+            'due_soon': summary.due_soon_count if summary else 0,
+            'completion_rate': round(stats.done / total, 3) if total else 0.0,
+            'overdue_computed_at': summary.computed_at if summary else None
+        }}, status.HTTP_200_OK)
+
 class TodoDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -103,7 +242,8 @@ class TodoDetailView(APIView):
         serializer1 = TodoSerializer(data=request.data, context={'request': request})
 
         if serializer1.is_valid():
-            serializer1.save(user=request.user)
+            todo = serializer1.save(user=request.user)
+            publish_todo_event(todo, 'created', serializer1.data)
 
             return Response({'todo': serializer1.data}, status=status.HTTP_201_CREATED)
 
@@ -136,13 +276,14 @@ class TodoDetailView(APIView):
         )
 
         if serializer.is_valid():
-            serializer.save()
+            todo = serializer.save()
+            publish_todo_event(todo, 'updated', serializer.data)
             return Response({'todo': serializer.data}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     def delete(self, request, pk):
         todo = get_object_or_404(Todo, pk=pk, user=request.user)
-        todo.delete()
+        _delete_and_publish(todo)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -172,7 +313,8 @@ class TodoByTitleView(APIView):
         serializer1 = TodoSerializer(todo, data=request.data, context={'request': request})
 
         if serializer1.is_valid():
-            serializer1.save()
+            todo = serializer1.save()
+            publish_todo_event(todo, 'updated', serializer1.data)
             return Response({'todo': serializer1.data}, status=status.HTTP_200_OK)
 
         return Response(serializer1.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -185,7 +327,7 @@ class TodoByTitleView(APIView):
             user=request.user,
             status__in=['notstarted', 'inprogress']
         )
-        todo.delete()
+        _delete_and_publish(todo)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -2,6 +2,8 @@
 ASGI config for todo_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSocket connections are routed by path, currently
+just the todo event stream at ``/ws/todos/``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todo_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from todo_app.sockets import todo_events_socket  # noqa: E402  (needs Django set up)
+
+WEBSOCKET_ROUTES = {
+    '/ws/todos/': todo_events_socket,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        handler = WEBSOCKET_ROUTES.get(scope['path'])
+        if handler is None:
+            await send({'type': 'websocket.close'})
+            return
+        return await handler(scope, receive, send)
+
+    return await django_application(scope, receive, send)
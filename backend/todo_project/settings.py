@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'todo_app.telemetry.TelemetryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -72,6 +74,30 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'todo_project.wsgi.application'
+ASGI_APPLICATION = 'todo_project.asgi.application'
+
+# Pushes todo create/update/delete events to WebSocket clients (/ws/todos/).
+# The in-memory broker only reaches connections on the same process.
+TODO_EVENTS_BROKER = 'todo_app.events.InMemoryBroker'
+
+# Used by `manage.py purge_todo_tombstones`. Change feed cursors older than
+# the purged tombstones get 410 Gone and have to resync from since=0.
+TODO_TOMBSTONE_RETENTION_DAYS = 30
+
+# Used by `manage.py send_due_reminders`.
+TODO_REMINDER_SINK = 'todo_app.reminders.LogSink'
+TODO_REMINDER_DUE_SOON_HOURS = 24
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'todo_app': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -96,23 +122,51 @@ SIMPLE_JWT = {
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.sqlite3',
-#         'NAME': BASE_DIR / 'db.sqlite3',
-#     }
-# }
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'todo_app',
-        'USER': 'postgres',
-        'PASSWORD': 'postgres',
-        #'HOST': 'codeworks-db',
-        'HOST': 'codeworks-db',
-        'PORT': '5432',
+if os.getenv('DB_ENGINE') == 'sqlite':
+    # Local runs and tests; full-text search falls back to substring matching.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Todo.save() reads before it writes; taking the write lock up
+            # front makes concurrent writers wait instead of failing with
+            # "database is locked" when SQLite cannot upgrade the lock.
+            'OPTIONS': {
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'todo_app'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
+            'HOST': os.getenv('DB_HOST', 'codeworks-db'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Keep connections open between requests instead of paying the
+            # connect/auth round trips every time; checked before reuse.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+    if os.getenv('DB_POOL', '1') == '1':
+        # psycopg 3 connection pool. This is what Django recommends under ASGI,
+        # where persistent connections are not reused reliably. The pool
+        # replaces CONN_MAX_AGE (Django refuses both at once); with
+        # CONN_HEALTH_CHECKS on, Django checks each connection on checkout.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+                'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            }
+        }
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
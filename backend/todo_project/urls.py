@@ -17,8 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from todo_app.telemetry import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('todo_app.urls')),
+    path('metrics', metrics_view, name='metrics'),
 
 ]
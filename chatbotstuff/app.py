@@ -1,17 +1,25 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
 from utils.memory import ConversationMemory
 from chains.todo_chain import TodoChain
+from utils.telemetry import setup_tracing, tracer
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
 import jwt
+import logging
 from functools import wraps
 
 load_dotenv()
 
+logging.basicConfig(level=logging.INFO)
+setup_tracing("chatbot")
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})  
 
+# Built once at import; under gunicorn (preload_app) that is in the master
+# before forking. Set CHAT_MEMORY_PATH so all workers share conversations.
 memory = ConversationMemory()
 todo_chain = TodoChain(memory)
 
@@ -39,12 +47,27 @@ def chat(token):
     data = request.json
     user_message = data.get('message', '')
     
-    response, commands = todo_chain.process(user_message, token)
+    timings = {}
+    with tracer.start_as_current_span("POST /chat"):
+        response, commands = todo_chain.process(user_message, token, timings)
     
-    return jsonify({
+    result = jsonify({
         'response': response,
         'commands': commands
     })
+    result.headers['Server-Timing'] = ", ".join(
+        f"{stage};dur={duration:.1f}" for stage, duration in timings.items()
+    )
+    return result
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        # Under gunicorn, aggregate the metrics of all workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
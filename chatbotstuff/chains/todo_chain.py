@@ -1,19 +1,26 @@
 from langchain_core.runnables import RunnablePassthrough
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from utils.context import TodoContextBuilder
+from utils.llm import create_chat_model
 from utils.parser import IntentParser
+from utils.responses import TemplateResponder
+from utils.telemetry import record_llm_usage, stage, tracer
 from utils.todo_api import TodoApiClient
 import json
-import os
+import requests
+import time
 from datetime import datetime
 
+OPEN_STATUSES = ("notstarted", "inprogress")
+
 class TodoChain:
-    def __init__(self, memory_manager):
+    def __init__(self, memory_manager, llm=None, intent_parser=None, todo_api=None):
         self.memory_manager = memory_manager
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.llm = ChatOpenAI(temperature=0.7, api_key=api_key)
-        self.intent_parser = IntentParser()
-        self.todo_api = TodoApiClient()
+        self.llm = llm or create_chat_model(temperature=0.7)
+        self.intent_parser = intent_parser or IntentParser()
+        self.todo_api = todo_api or TodoApiClient()
+        self.context_builder = TodoContextBuilder()
+        self.template_responder = TemplateResponder()
         
         self.response_prompt = ChatPromptTemplate.from_template("""
         You are a helpful AI assistant integrated with a TODO app.
@@ -25,12 +32,15 @@ class TodoChain:
         User: {user_message}
         
         Action performed: {action_performed}
-        Result: {result}
+        Result:
+        {result}
         
         Respond in a natural, conversational way. Be concise but friendly.
         Don't mention the technical details of the action unless necessary.
         If the action failed, ask for more information or suggest alternatives.
         Do not reference the JSON command in your response, it will be attached automatically.
+        Todo results are listed one per line as id|title|status|due|depends_on|description,
+        open todos first; a "(+N more not shown)" line means the list was truncated.
         """)
         
         self.response_chain = self.response_prompt | self.llm
@@ -55,6 +65,45 @@ class TodoChain:
         except Exception:
             return datetime.now().strftime("%Y-%m-%dT00:00:00Z")
     
+    def _find_todo(self, title, token):
+        """Open todo with exactly this title, or None when there is none"""
+        try:
+            return self.todo_api.get_todo_by_title(title, token)["todo"]
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+        return None
+    
+    def _resolve_todo(self, title, token):
+        """
+        Resolve a loose reference for update/delete. Returns (todo, candidates):
+        the todo when exactly one open todo matches every keyword, otherwise
+        the open todos it might refer to so the user can pick one.
+        """
+        todo = self._find_todo(title, token)
+        if todo:
+            return todo, []
+        
+        matches = self.todo_api.search_todos(title, token, match_all=True, statuses=OPEN_STATUSES)["todo"]
+        if len(matches) == 1:
+            return matches[0], []
+        if not matches:
+            # Partial matches ("buy bread" vs "Buy shoes") are only offered
+            matches = self.todo_api.search_todos(title, token, statuses=OPEN_STATUSES)["todo"]
+        return None, matches
+    
+    def _unresolved(self, title, candidates):
+        if not candidates:
+            return "todo_not_found", {"error": f"Could not find TODO with title: {title}"}
+        
+        options = [f"'{todo['title']}' (#{todo['id']})" for todo in candidates]
+        question = f"Did you mean {options[0]}?" if len(options) == 1 else f"Which TODO do you mean: {', '.join(options)}?"
+        return "todo_ambiguous", {
+            "question": question,
+            "todo": candidates
+        }
+    
+    @tracer.start_as_current_span("TodoChain._execute_action")
     def _execute_action(self, action, token):
         try:
             if action.action_type == "create":
@@ -79,15 +128,16 @@ class TodoChain:
                     return "missing_identifier", {"error": "No TODO ID or title provided for update"}
                 
                 todo_id = action.todo_id
-                if not todo_id and action.title:
-                    try:
-                        todo = self.todo_api.get_todo_by_title(action.title, token)
-                        todo_id = todo["todo"]["id"]
-                    except Exception as e:
-                        return "todo_not_found", {"error": f"Could not find TODO with title: {action.title}"}
+                if not todo_id:
+                    todo, candidates = self._resolve_todo(action.title, token)
+                    if not todo:
+                        return self._unresolved(action.title, candidates)
+                    todo_id = todo["id"]
                 
                 update_data = {}
-                if action.title:
+                # Without an ID the title only identified the todo (possibly
+                # loosely), so it must not be written back as a rename.
+                if action.title and action.todo_id:
                     update_data["title"] = action.title
                 if action.description:
                     update_data["description"] = action.description
@@ -105,27 +155,55 @@ class TodoChain:
                 if not action.todo_id and not action.title:
                     return "missing_identifier", {"error": "No TODO ID or title provided for deletion"}
                 
-                todo_id = action.todo_id
-                if not todo_id and action.title:
-                    try:
-                        todo = self.todo_api.get_todo_by_title(action.title, token)
-                        todo_id = todo["todo"]["id"]
-                    except Exception as e:
-                        return "todo_not_found", {"error": f"Could not find TODO with title: {action.title}"}
+                todo_id, title = action.todo_id, action.title
+                if not todo_id:
+                    todo, candidates = self._resolve_todo(action.title, token)
+                    if not todo:
+                        return self._unresolved(action.title, candidates)
+                    todo_id, title = todo["id"], todo["title"]
                 
                 result = self.todo_api.delete_todo(todo_id, token)
-                return "delete_success", result
+                return "delete_success", {**result, "title": title}
                 
             elif action.action_type == "get":
                 if action.todo_id:
                     result = self.todo_api.get_todo_by_id(action.todo_id, token)
                     return "get_success", result
                 elif action.title:
-                    result = self.todo_api.get_todo_by_title(action.title, token)
-                    return "get_success", result
+                    # Showing the closest match is harmless, so a loose
+                    # reference takes the top search hit here
+                    todo = self._find_todo(action.title, token)
+                    if not todo:
+                        matches = self.todo_api.search_todos(action.title, token, limit=1)["todo"]
+                        todo = matches[0] if matches else None
+                    if not todo:
+                        return "todo_not_found", {"error": f"Could not find TODO with title: {action.title}"}
+                    return "get_success", {"todo": todo}
                 else:
                     return "missing_identifier", {"error": "No TODO ID or title provided to get"}
                 
+            elif action.action_type == "search" or (action.action_type == "list" and action.title):
+                if not action.title:
+                    return "missing_query", {"error": "No search terms provided"}
+                
+                result = self.todo_api.search_todos(action.title, token)
+                return "search_success", result
+                
+            elif action.action_type == "overdue":
+                summary = self.todo_api.get_overdue_summary(token)
+                return "overdue_success", {
+                    "overdue_count": summary["overdue_count"],
+                    "due_soon_count": summary["due_soon_count"],
+                    "todo": summary["items"]
+                }
+                
+            elif action.action_type == "stats":
+                result = self.todo_api.get_stats(token)
+                return "stats_success", result["stats"]
+                
+            elif action.action_type == "clarify":
+                return "needs_clarification", {"question": action.question}
+                
             elif action.action_type == "list":
                 result = self.todo_api.get_todos(token)
                 return "list_success", result
@@ -136,36 +214,54 @@ class TodoChain:
         except Exception as e:
             return "error", {"error": str(e)}
     
-    def process(self, user_message, token):
+    def process(self, user_message, token, timings=None):
+        """Handle one chat turn; per-stage durations in ms go into `timings` if given"""
+        timings = timings if timings is not None else {}
+        
         self.memory_manager.add_message(token, "user", user_message)
         
         chat_history = self.memory_manager.get_history(token)
         
-        parsed_action = self.intent_parser.parse_intent(user_message)
+        started = time.perf_counter()
+        with stage("parse"):
+            parsed_action = self.intent_parser.parse_intent(user_message)
+        timings["parse"] = (time.perf_counter() - started) * 1000
         
-        action_status, result = self._execute_action(parsed_action, token)
+        started = time.perf_counter()
+        with stage("execute"):
+            action_status, result = self._execute_action(parsed_action, token)
+        timings["execute"] = (time.perf_counter() - started) * 1000
         
-        command_info = {
-            "action": parsed_action.dict(),
-            "status": action_status,
-            "result": result
-        }
-        
-        formatted_history = "\n".join([
-            f"{msg.type.capitalize()}: {msg.content}" 
-            for msg in chat_history[:-1] 
-        ]) if len(chat_history) > 1 else ""
+        started = time.perf_counter()
+        with stage("respond"):
+            context = self.context_builder.build(result)
+            
+            command_info = {
+                "action": parsed_action.dict(),
+                "status": action_status,
+                "result": context.result
+            }
+            
+            response = self.template_responder.render(action_status, parsed_action, result, user_message)
+            
+            if response is None:
+                formatted_history = "\n".join([
+                    f"{msg.type.capitalize()}: {msg.content}" 
+                    for msg in chat_history[:-1] 
+                ]) if len(chat_history) > 1 else ""
+                
+                reply = self.response_chain.invoke({
+                    "chat_history": formatted_history,
+                    "user_message": user_message,
+                    "action_performed": parsed_action.action_type,
+                    "result": context.text
+                })
+                record_llm_usage("response", reply)
+                response = reply.content
+        timings["respond"] = (time.perf_counter() - started) * 1000
         
         command_json = json.dumps(command_info, indent=2)
         
-        response = self.response_chain.invoke({
-            "chat_history": formatted_history,
-            "user_message": user_message,
-            "action_performed": parsed_action.action_type,
-            "result": json.dumps(result),
-            "command_json": command_json 
-        }).content
-        
         final_response = f"{response}\n\n```json\n{command_json}\n```"
         
         self.memory_manager.add_message(token, "ai", response)
@@ -0,0 +1,34 @@
+# Production server for the chatbot: `gunicorn -c gunicorn.conf.py app:app`
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv("CHATBOT_BIND", "0.0.0.0:5000")
+
+# Requests mostly wait on the LLM and the backend, so each worker also runs
+# a few threads.
+workers = int(os.getenv("CHATBOT_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("CHATBOT_THREADS", "8"))
+worker_class = "gthread"
+timeout = int(os.getenv("CHATBOT_TIMEOUT", "120"))
+keepalive = 5
+
+# Import app.py (and build TodoChain/IntentParser and their clients) once in
+# the master; workers inherit them through fork instead of each rebuilding.
+preload_app = True
+
+accesslog = "-"
+
+# Prometheus multiprocess mode: every worker writes its metrics here and
+# /metrics aggregates them. Reset it here, before preload imports the app and
+# its metrics.
+metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if metrics_dir:
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if metrics_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
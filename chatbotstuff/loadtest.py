@@ -0,0 +1,151 @@
+"""
+Load generator for the chatbot's /chat endpoint.
+
+Registers a batch of throwaway users on the Django backend, then has each one
+hold a scripted conversation with the chatbot concurrently, and reports
+throughput, latency percentiles and the per-stage timings (parse, execute,
+respond) the chatbot returns in its Server-Timing header. Turns whose action
+failed on the backend come back as HTTP 200 and are counted as failed
+actions, separately from HTTP errors.
+
+Fully offline run:
+
+    cd backend && DB_ENGINE=sqlite python manage.py migrate && DB_ENGINE=sqlite python manage.py runserver
+    cd chatbotstuff && LLM_PROVIDER=fake FAKE_LLM_LATENCY_MS=300 python app.py
+    cd chatbotstuff && python loadtest.py --users 20 --turns 10
+"""
+import argparse
+import statistics
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CONVERSATION = [
+    "add buy milk {n}",
+    "list my todos",
+    "start buy milk {n}",
+    "find milk",
+    "mark buy milk {n} as done",
+    "how many tasks are left",
+    "what's overdue",
+    "add write report {n}",
+    "delete write report {n}",
+    "show all todos",
+]
+
+# /chat answers 200 even when the action failed on the backend; these
+# command statuses count as failed turns.
+FAILED_STATUSES = ("error", "unknown_action")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def parse_server_timing(header):
+    timings = {}
+    for entry in filter(None, (part.strip() for part in (header or "").split(","))):
+        name, _, params = entry.partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                timings[name] = float(value)
+    return timings
+
+
+def register_user(api_url, run_id, index):
+    response = requests.post(f"{api_url}/register/", json={
+        "username": f"load-{run_id}-{index}",
+        "email": f"load-{run_id}-{index}@example.com",
+        "password": "load-test-password-123",
+    })
+    response.raise_for_status()
+    return response.json()["access"]
+
+
+def run_conversation(chat_url, token, turns, user_index):
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    samples = []
+
+    for turn in range(turns):
+        message = CONVERSATION[turn % len(CONVERSATION)].format(n=f"{user_index}-{turn // len(CONVERSATION)}")
+        started = time.perf_counter()
+        sample = {"ok": False, "http_error": None, "action_error": None, "stages": {}}
+        try:
+            response = session.post(chat_url, json={"message": message})
+            sample["stages"] = parse_server_timing(response.headers.get("Server-Timing"))
+            if response.ok:
+                commands = response.json().get("commands") or {}
+                if commands.get("status") in FAILED_STATUSES:
+                    error = (commands.get("result") or {}).get("error", "")
+                    sample["action_error"] = f"{commands['status']}: {error}"[:120]
+                else:
+                    sample["ok"] = True
+            else:
+                sample["http_error"] = f"HTTP {response.status_code}"
+        except (requests.RequestException, ValueError) as e:
+            sample["http_error"] = type(e).__name__
+        sample["latency"] = (time.perf_counter() - started) * 1000
+        samples.append(sample)
+
+    return samples
+
+
+def report(samples, elapsed):
+    latencies = [sample["latency"] for sample in samples if sample["ok"]]
+    http_errors = Counter(sample["http_error"] for sample in samples if sample["http_error"])
+    action_errors = Counter(sample["action_error"] for sample in samples if sample["action_error"])
+
+    print(f"requests     {len(samples)} in {elapsed:.1f}s, "
+          f"{sum(http_errors.values())} HTTP errors, {sum(action_errors.values())} failed actions")
+    for error, count in (http_errors + action_errors).most_common(5):
+        print(f"  {count:>5}x {error}")
+    print(f"throughput   {len(samples) / elapsed:.1f} req/s")
+    print("latency ms   p50 {:.0f}  p90 {:.0f}  p99 {:.0f}  max {:.0f}".format(
+        percentile(latencies, 50), percentile(latencies, 90),
+        percentile(latencies, 99), max(latencies, default=0)
+    ))
+
+    stages = defaultdict(list)
+    for sample in samples:
+        for stage, duration in sample["stages"].items():
+            stages[stage].append(duration)
+
+    for stage, durations in stages.items():
+        print(f"  {stage:<10} mean {statistics.mean(durations):.0f}  p90 {percentile(durations, 90):.0f}  "
+              f"p99 {percentile(durations, 99):.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-url", default="http://127.0.0.1:8000/api")
+    parser.add_argument("--chat-url", default="http://127.0.0.1:5000/chat")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=10, help="chat messages per user")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        tokens = list(pool.map(lambda index: register_user(args.api_url, run_id, index), range(args.users)))
+
+        started = time.perf_counter()
+        results = pool.map(
+            lambda item: run_conversation(args.chat_url, item[1], args.turns, item[0]),
+            enumerate(tokens)
+        )
+        samples = [sample for user_samples in results for sample in user_samples]
+        elapsed = time.perf_counter() - started
+
+    report(samples, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+from dataclasses import dataclass
+
+OPEN_STATUSES = ("notstarted", "inprogress")
+TABLE_HEADER = "id|title|status|due|depends_on|description"
+
+
+@dataclass
+class TodoContext:
+    text: str
+    result: dict
+
+
+class TodoContextBuilder:
+    """Renders action results as a small table for the response prompt"""
+
+    def __init__(self, token_budget=None, description_chars=60):
+        self.token_budget = token_budget or int(os.getenv("TODO_CONTEXT_TOKENS", "600"))
+        self.description_chars = description_chars
+
+    @staticmethod
+    def _estimate_tokens(text):
+        # ~4 characters per token is close enough for budgeting English text
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def _rank_key(todo):
+        # Open todos first, then the nearest due date; undated ones last
+        due_date = todo.get("due_date")
+        return (
+            todo.get("status") not in OPEN_STATUSES,
+            due_date is None,
+            due_date or "",
+            todo.get("id") or 0,
+        )
+
+    def _cell(self, value, limit=None):
+        if value is None or value == "":
+            return "-"
+        text = " ".join(str(value).split()).replace("|", "/")
+        if limit and len(text) > limit:
+            text = text[:limit - 1] + "…"
+        return text
+
+    def _row(self, todo):
+        due_date = todo.get("due_date")
+        return "|".join([
+            self._cell(todo.get("id")),
+            self._cell(todo.get("title")),
+            self._cell(todo.get("status")),
+            self._cell(due_date[:10] if due_date else None),
+            self._cell(todo.get("dependency")),
+            self._cell(todo.get("description"), self.description_chars),
+        ])
+
+    def _summary_line(self, values):
+        return "; ".join(f"{key}={self._cell(value)}" for key, value in values.items())
+
+    def _build_list(self, todos, extra=None):
+        lines = [self._summary_line(extra)] if extra else []
+        lines.append(TABLE_HEADER)
+        used = sum(self._estimate_tokens(line) for line in lines)
+        kept = []
+
+        for todo in sorted(todos, key=self._rank_key):
+            row = self._row(todo)
+            cost = self._estimate_tokens(row)
+            if used + cost > self.token_budget:
+                break
+            lines.append(row)
+            kept.append(todo)
+            used += cost
+
+        omitted = len(todos) - len(kept)
+        if omitted:
+            lines.append(f"(+{omitted} more not shown)")
+        if not todos:
+            lines = lines[:-1] + ["no todos"]
+
+        return TodoContext("\n".join(lines), {**(extra or {}), "todo": kept, "omitted": omitted})
+
+    def build(self, result):
+        todo = result.get("todo") if isinstance(result, dict) else None
+
+        if isinstance(todo, list):
+            extra = {key: value for key, value in result.items() if key != "todo"}
+            return self._build_list(todo, extra)
+
+        if isinstance(todo, dict):
+            return TodoContext(f"{TABLE_HEADER}\n{self._row(todo)}", result)
+
+        if isinstance(result, dict):
+            return TodoContext(self._summary_line(result) or "-", result)
+
+        return TodoContext(self._cell(result), result)
@@ -0,0 +1,128 @@
+import json
+import os
+import random
+import re
+import time
+from itertools import count
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai import ChatOpenAI
+
+USER_MESSAGE = re.compile(r"User message:\s*(.*?)\n\s*\n", re.DOTALL)
+
+# Keyword rules the fake model uses when the script has no match.
+# Each maps a pattern over the user message to an intent; (?P<title>) fills the title.
+DEFAULT_INTENT_RULES = [
+    (r"(?:add|create|new)\s+(?:a\s+)?(?:todo\s+)?(?P<title>.+)", {"action_type": "create"}),
+    (r"(?:delete|remove)\s+(?P<title>.+)", {"action_type": "delete"}),
+    (r"(?:mark|set)\s+(?P<title>.+?)\s+as\s+done", {"action_type": "update", "status": "done"}),
+    (r"(?:start|begin)\s+(?P<title>.+)", {"action_type": "update", "status": "inprogress"}),
+    (r"overdue|due soon", {"action_type": "overdue"}),
+    (r"how many|stats|progress", {"action_type": "stats"}),
+    (r"(?:find|search for)\s+(?P<title>.+)", {"action_type": "search"}),
+    (r"\blist\b|\ball\b|\bmy todos\b", {"action_type": "list"}),
+    (r"(?:show|get)\s+(?P<title>.+)", {"action_type": "get"}),
+]
+
+DEFAULT_RESPONSES = [
+    "Sure, that's taken care of.",
+    "Done! Anything else?",
+    "Here you go.",
+]
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline stand-in for ChatOpenAI with configurable latency and scripted
+    outputs. Intent prompts get a TodoAction (as a tool call when a schema is
+    bound, JSON otherwise); any other prompt gets a canned reply."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    intent_rules: List[Any] = DEFAULT_INTENT_RULES
+    responses: List[str] = DEFAULT_RESPONSES
+    _calls: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._calls = count()
+
+    @classmethod
+    def from_env(cls):
+        kwargs = {
+            "latency_ms": float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+            "jitter_ms": float(os.getenv("FAKE_LLM_JITTER_MS", "0")),
+        }
+
+        script_path = os.getenv("FAKE_LLM_SCRIPT")
+        if script_path:
+            # {"intents": [{"pattern": "...", "action": {...}}], "responses": ["..."]}
+            with open(script_path) as f:
+                script = json.load(f)
+            rules = [(rule["pattern"], rule["action"]) for rule in script.get("intents", [])]
+            kwargs["intent_rules"] = rules + DEFAULT_INTENT_RULES
+            if script.get("responses"):
+                kwargs["responses"] = script["responses"]
+
+        return cls(**kwargs)
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _intent(self, message):
+        for pattern, action in self.intent_rules:
+            match = re.search(pattern, message, re.IGNORECASE)
+            if match:
+                intent = dict(action)
+                title = match.groupdict().get("title")
+                if title:
+                    intent["title"] = title.strip(" .!?'\"")
+                return intent
+        return {"action_type": "clarify", "question": "What would you like to do with your TODOs?"}
+
+    def _generate(self, messages, stop=None, run_manager=None, tools: Optional[list] = None, **kwargs):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        prompt = "\n".join(str(message.content) for message in messages)
+        user_message = USER_MESSAGE.search(prompt + "\n\n")
+
+        if user_message:
+            intent = self._intent(user_message.group(1).strip())
+            if tools:
+                name = tools[0]["function"]["name"]
+                message = AIMessage(content="", tool_calls=[{"name": name, "args": intent, "id": "fake-call"}])
+            else:
+                message = AIMessage(content=json.dumps(intent))
+        else:
+            message = AIMessage(content=self.responses[next(self._calls) % len(self.responses)])
+
+        input_tokens = len(prompt) // 4
+        output_tokens = len(str(message.content) or json.dumps(message.tool_calls)) // 4
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def create_chat_model(temperature=0):
+    """Chat model for the configured LLM_PROVIDER: "openai" (default) or "fake" for offline runs"""
+    provider = os.getenv("LLM_PROVIDER", "openai")
+
+    if provider == "fake":
+        return FakeChatModel.from_env()
+    if provider == "openai":
+        return ChatOpenAI(temperature=temperature, api_key=os.getenv("OPENAI_API_KEY"))
+
+    raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
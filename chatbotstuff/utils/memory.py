@@ -1,25 +1,84 @@
-from langchain.memory import ConversationBufferMemory
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+class InMemoryMessageStore:
+    """Per-process store; fine for the dev server, not shared between workers"""
 
-class ConversationMemory:
     def __init__(self):
-        self.memories = {}
-    
-    def get_memory(self, token):
-        memory_key = str(hash(token))
-        if memory_key not in self.memories:
-            self.memories[memory_key] = ConversationBufferMemory(
-                memory_key="chat_history",
-                return_messages=True
+        self.messages = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def append(self, session, role, content):
+        with self.lock:
+            self.messages[session].append((role, content))
+
+    def load(self, session):
+        with self.lock:
+            return list(self.messages.get(session, ()))
+
+class SqliteMessageStore:
+    """File-backed store shared by every worker process on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL
             )
-        return self.memories[memory_key]
-    
+        """)
+        self._connect().execute("CREATE INDEX IF NOT EXISTS chat_messages_session ON chat_messages (session, id)")
+
+    def _connect(self):
+        # One connection per thread, opened after fork (connections must not
+        # cross process boundaries)
+        connection = getattr(self.local, "connection", None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def append(self, session, role, content):
+        self._connect().execute(
+            "INSERT INTO chat_messages (session, role, content, created_at) VALUES (?, ?, ?, ?)",
+            (session, role, content, time.time())
+        )
+
+    def load(self, session):
+        return self._connect().execute(
+            "SELECT role, content FROM chat_messages WHERE session = ? ORDER BY id", (session,)
+        ).fetchall()
+
+def create_message_store():
+    path = os.getenv("CHAT_MEMORY_PATH")
+    return SqliteMessageStore(path) if path else InMemoryMessageStore()
+
+class ConversationMemory:
+    def __init__(self, store=None):
+        self.store = store or create_message_store()
+
+    def _session_key(self, token):
+        # Stable across processes, unlike hash() which is salted per interpreter
+        return hashlib.sha256(token.encode()).hexdigest()
+
     def add_message(self, token, role, content):
-        memory = self.get_memory(token)
-        if role == "user":
-            memory.chat_memory.add_user_message(content)
-        else:
-            memory.chat_memory.add_ai_message(content)
-    
+        self.store.append(self._session_key(token), "user" if role == "user" else "ai", content)
+
     def get_history(self, token):
-        memory = self.get_memory(token)
-        return memory.chat_memory.messages
\ No newline at end of file
+        return [
+            HumanMessage(content=content) if role == "user" else AIMessage(content=content)
+            for role, content in self.store.load(self._session_key(token))
+        ]
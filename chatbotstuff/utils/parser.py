@@ -1,23 +1,64 @@
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-from typing import Optional
-import os
+from utils.llm import create_chat_model
+from utils.telemetry import INTENT_PATHS, record_llm_usage, tracer
+from typing import Literal, Optional, get_args
+from collections import Counter
+import re
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+ActionType = Literal["create", "update", "delete", "list", "get", "search", "overdue", "stats", "clarify"]
+TodoStatus = Literal["notstarted", "inprogress", "done"]
+
+ACTION_TYPES = get_args(ActionType)
+STATUSES = get_args(TodoStatus)
+
+ACTION_ALIASES = {
+    "add": "create",
+    "new": "create",
+    "edit": "update",
+    "modify": "update",
+    "remove": "delete",
+    "show": "get",
+    "find": "search",
+}
+
+STATUS_ALIASES = {
+    "not started": "notstarted",
+    "not_started": "notstarted",
+    "in progress": "inprogress",
+    "in_progress": "inprogress",
+    "started": "inprogress",
+    "doing": "inprogress",
+    "complete": "done",
+    "completed": "done",
+    "finished": "done",
+}
+
+DEFAULT_CLARIFICATION = "Could you tell me a bit more about what you'd like to do with your TODOs?"
 
 class TodoAction(BaseModel):
-    action_type: str = Field(description="The type of action to perform (create, update, delete, list, get)")
+    action_type: ActionType = Field(description="The type of action to perform")
     todo_id: Optional[int] = Field(None, description="The ID of the todo, if applicable")
     title: Optional[str] = Field(None, description="The title of the todo")
     description: Optional[str] = Field(None, description="The description of the todo")
-    status: Optional[str] = Field(None, description="The status of the todo (notstarted, inprogress, done)")
+    status: Optional[TodoStatus] = Field(None, description="The status of the todo")
     dependency: Optional[int] = Field(None, description="The ID of the todo this one depends on")
     due_date: Optional[str] = Field(None, description="The due date of the todo in YYYY-MM-DDThh:mm:ssZ format")
+    question: Optional[str] = Field(None, description="A short question to ask the user when the request is too ambiguous to act on")
 
 class IntentParser:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.llm = ChatOpenAI(temperature=0, api_key=api_key)
+    def __init__(self, llm=None):
+        self.llm = llm or create_chat_model(temperature=0)
+        # Function calling bound to the TodoAction schema; include_raw keeps
+        # the raw reply around for the repair pass when validation fails.
+        self.structured_llm = self.llm.with_structured_output(
+            TodoAction, method="function_calling", include_raw=True
+        )
+        self.path_counts = Counter()
         
         self.prompt_template = """
         You are an AI assistant that helps users manage their TODOs through natural language.
@@ -29,6 +70,13 @@ class IntentParser:
         - delete: Delete a TODO
         - list: List all TODOs
         - get: Get a specific TODO by ID or title
+        - search: Find TODOs matching a vague description; put the keywords in title
+        - overdue: Show TODOs that are overdue or due soon
+        - stats: Answer questions about counts or progress (e.g. "how many tasks are left?")
+        - clarify: The request is too ambiguous to act on; put a short question for the user in question
+        
+        If the user refers to a TODO loosely (e.g. "the report thing"), put the
+        keywords they used in title; it does not have to be the exact title.
         
         Status values must be one of: notstarted, inprogress, done
         
@@ -36,13 +84,14 @@ class IntentParser:
         
         Return a JSON object with the following structure:
         {{
-            "action_type": string (create, update, delete, list, or get),
+            "action_type": string (create, update, delete, list, get, search, overdue, stats, or clarify),
             "todo_id": number or null,
             "title": string or null,
             "description": string or null,
             "status": string or null,
             "dependency": number or null,
-            "due_date": string or null
+            "due_date": string or null,
+            "question": string or null
         }}
         
         JSON response:
@@ -53,31 +102,105 @@ class IntentParser:
             ("human", self.prompt_template)
         ])
     
+    def _record(self, path):
+        self.path_counts[path] += 1
+        INTENT_PATHS.labels(path=path).inc()
+        total = sum(self.path_counts.values())
+        logger.info(
+            "Intent parsed via %s (%s)",
+            path,
+            ", ".join(f"{name}={count}/{total}" for name, count in sorted(self.path_counts.items()))
+        )
+    
+    @staticmethod
+    def _repair_json(text):
+        """Best-effort fix-ups for near-valid JSON: code fences, surrounding prose,
+        Python literals, single quotes and trailing commas"""
+        if not text:
+            return None
+        
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        candidate = text[start:end + 1]
+        
+        attempts = [candidate]
+        fixed = re.sub(r",\s*([}\]])", r"\1", candidate)
+        fixed = re.sub(r"\bNone\b", "null", fixed)
+        fixed = re.sub(r"\bTrue\b", "true", re.sub(r"\bFalse\b", "false", fixed))
+        attempts.append(fixed)
+        if '"' not in fixed:
+            attempts.append(fixed.replace("'", '"'))
+        
+        for attempt in attempts:
+            try:
+                data = json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict):
+                return data
+        return None
+    
+    def _to_action(self, data):
+        action_type = str(data.get("action_type") or "").strip().lower()
+        action_type = ACTION_ALIASES.get(action_type, action_type)
+        if action_type not in ACTION_TYPES:
+            return None
+        
+        if action_type == "clarify" and not data.get("question"):
+            data = {**data, "question": DEFAULT_CLARIFICATION}
+        
+        status = data.get("status")
+        if isinstance(status, str):
+            status = status.strip().lower()
+            status = STATUS_ALIASES.get(status, status)
+            data = {**data, "status": status if status in STATUSES else None}
+        
+        try:
+            return TodoAction(**{**data, "action_type": action_type})
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _raw_arguments(raw):
+        # Tool call arguments that failed validation, else plain content
+        if raw is None:
+            return None
+        for call in getattr(raw, "tool_calls", None) or []:
+            return json.dumps(call.get("args") or {})
+        for call in getattr(raw, "invalid_tool_calls", None) or []:
+            if call.get("args"):
+                return call["args"]
+        return raw.content if isinstance(raw.content, str) else None
+    
+    @tracer.start_as_current_span("IntentParser.parse_intent")
     def parse_intent(self, user_message):
+        messages = self.prompt.format_messages(message=user_message)
+        
         try:
-            messages = self.prompt.format_messages(message=user_message)
-            
-            response = self.llm.invoke(messages)
-            
-            response_text = response.content.strip()
-            try:
-                response_json = json.loads(response_text)
-                
-                action = TodoAction(
-                    action_type=response_json.get("action_type", "list"),
-                    todo_id=response_json.get("todo_id"),
-                    title=response_json.get("title"),
-                    description=response_json.get("description"),
-                    status=response_json.get("status"),
-                    dependency=response_json.get("dependency"),
-                    due_date=response_json.get("due_date")
-                )
-                return action
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON: {e}")
-                print(f"Response text: {response_text}")
-                return TodoAction(action_type="list")
-                
+            output = self.structured_llm.invoke(messages)
         except Exception as e:
-            print(f"Error parsing intent: {e}")
-            return TodoAction(action_type="list")
\ No newline at end of file
+            logger.warning("Intent LLM call failed: %s", e)
+            self._record("clarify")
+            return TodoAction(action_type="clarify", question=DEFAULT_CLARIFICATION)
+        
+        record_llm_usage("intent", output.get("raw"))
+        
+        parsed = output.get("parsed")
+        if parsed is not None:
+            action = self._to_action(parsed.model_dump())
+            if action is not None:
+                self._record("structured")
+                return action
+        
+        data = self._repair_json(self._raw_arguments(output.get("raw")))
+        action = self._to_action(data) if data else None
+        if action is not None:
+            self._record("repaired")
+            return action
+        
+        # Guessing would mean running an action the user never asked for;
+        # asking back is cheaper than defaulting to a full list.
+        logger.info("Could not parse intent: %s", output.get("parsing_error"))
+        self._record("clarify")
+        return TodoAction(action_type="clarify", question=DEFAULT_CLARIFICATION)
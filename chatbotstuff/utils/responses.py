@@ -0,0 +1,170 @@
+import logging
+import os
+import random
+import re
+from collections import Counter
+from utils.telemetry import RESPONSE_PATHS
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("notstarted", "inprogress")
+MAX_TITLES = 5
+STATUS_NAMES = {"notstarted": "not started", "inprogress": "in progress", "done": "done"}
+
+QUESTION_START = re.compile(
+    r"^\s*(what|what's|whats|how|why|when|which|who|where|can|could|should|is|are|do|does|did|will|would)\b",
+    re.IGNORECASE
+)
+# "Can you add milk?" is a request, not a question
+POLITE_REQUEST = re.compile(r"^\s*(please\s+)?(can|could|would|will)\s+you\b", re.IGNORECASE)
+
+TEMPLATES = {
+    "create_success": [
+        "Done, I created '{title}'.",
+        "Got it, '{title}' is on your list now.",
+        "Added '{title}' to your TODOs.",
+    ],
+    "update_success": [
+        "Done, I updated '{title}'.",
+        "'{title}' is updated.",
+        "All set, '{title}' has been updated.",
+    ],
+    "delete_success": [
+        "Done, I deleted {name}.",
+        "{name_capitalized} is gone from your list.",
+        "Removed {name}.",
+    ],
+    "get_success": [
+        "'{title}' is {status}{due}.",
+        "Here it is: '{title}', {status}{due}.",
+    ],
+    "list_success": [
+        "You have {count} TODOs, {open} of them still open: {titles}.",
+        "Here are your TODOs ({open} of {count} open): {titles}.",
+    ],
+    "list_empty": [
+        "You don't have any TODOs yet.",
+        "Your TODO list is empty.",
+    ],
+    "search_success": [
+        "I found {count} matching TODOs: {titles}.",
+        "These look like what you mean: {titles}.",
+    ],
+    "search_empty": [
+        "I couldn't find any TODOs matching that.",
+        "Nothing on your list matches that.",
+    ],
+    "overdue_success": [
+        "You have {overdue_count} overdue TODOs and {due_soon_count} due soon.",
+        "{overdue_count} TODOs are overdue and {due_soon_count} are coming up soon.",
+    ],
+    "stats_success": [
+        "You have {open} open TODOs ({blocked} blocked) and {done} done, {percent}% complete.",
+        "{open} TODOs left to do, {blocked} of them blocked; {done} done so far ({percent}%).",
+    ],
+    "missing_title": [
+        "What should I call the new TODO?",
+        "Sure, what's the title of the TODO?",
+    ],
+    "missing_query": [
+        "What should I search for?",
+        "Sure, which TODOs are you looking for?",
+    ],
+    "missing_identifier": [
+        "Which TODO do you mean? Tell me its title or ID.",
+        "Could you tell me the title or ID of the TODO?",
+    ],
+    "todo_ambiguous": [
+        "{question}",
+    ],
+    "needs_clarification": [
+        "{question}",
+    ],
+    "todo_not_found": [
+        "I couldn't find a TODO matching '{title}'. Could you check the title?",
+        "There's no open TODO called '{title}'. Did you mean a different one?",
+    ],
+}
+
+EMPTY_STATUSES = {"list_success": "list_empty", "search_success": "search_empty"}
+# The reply is a question that is already written, so these are templated
+# even when the user's message was a question
+ASK_BACK_STATUSES = ("needs_clarification", "todo_ambiguous")
+
+
+class TemplateResponder:
+    """Answers standard action outcomes from canned templates so the turn
+    does not need a second LLM call"""
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.getenv("TEMPLATE_RESPONSES", "1").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+        self.counts = Counter()
+
+    @staticmethod
+    def is_question(message):
+        if POLITE_REQUEST.match(message):
+            return False
+        return "?" in message or bool(QUESTION_START.match(message))
+
+    def _values(self, action_status, action, result):
+        todo = result.get("todo") if isinstance(result, dict) else None
+
+        if isinstance(todo, dict):
+            due_date = todo.get("due_date")
+            return {
+                "title": todo.get("title") or action.title,
+                "status": STATUS_NAMES.get(todo.get("status"), todo.get("status")),
+                "due": f", due {due_date[:10]}" if due_date else "",
+            }
+
+        if isinstance(todo, list):
+            if action_status == "list_success":
+                # Open todos are the ones worth naming first
+                todo = sorted(todo, key=lambda item: item.get("status") not in OPEN_STATUSES)
+            titles = [f"'{item.get('title')}'" for item in todo[:MAX_TITLES]]
+            if len(todo) > MAX_TITLES:
+                titles[-1] += f" and {len(todo) - MAX_TITLES} more"
+            return {
+                **result,
+                "count": len(todo),
+                "open": sum(item.get("status") in OPEN_STATUSES for item in todo),
+                "titles": ", ".join(titles),
+            }
+
+        if action_status == "delete_success":
+            title = result.get("title") or action.title
+            name = f"'{title}'" if title else f"TODO #{result.get('id')}"
+            return {"name": name, "name_capitalized": name[0].upper() + name[1:]}
+
+        if action_status == "stats_success":
+            return {**result, "percent": round(result.get("completion_rate", 0) * 100)}
+
+        return {"title": action.title, **(result if isinstance(result, dict) else {})}
+
+    def render(self, action_status, action, result, user_message):
+        """Returns the templated reply, or None when the LLM should answer"""
+        response = None
+
+        if self.enabled and (action_status in ASK_BACK_STATUSES or not self.is_question(user_message)):
+            if action_status in EMPTY_STATUSES and not (result or {}).get("todo"):
+                action_status = EMPTY_STATUSES[action_status]
+
+            templates = TEMPLATES.get(action_status)
+            if templates:
+                try:
+                    response = random.choice(templates).format(**self._values(action_status, action, result))
+                except (KeyError, AttributeError, TypeError, ValueError):
+                    response = None
+
+        self.counts["template" if response else "llm"] += 1
+        RESPONSE_PATHS.labels(path="template" if response else "llm").inc()
+        total = sum(self.counts.values())
+        logger.info(
+            "Response via %s; %d/%d turns (%.0f%%) skipped the LLM",
+            "template" if response else "llm",
+            self.counts["template"], total, 100 * self.counts["template"] / total
+        )
+
+        return response
@@ -0,0 +1,77 @@
+import os
+import time
+from contextlib import contextmanager
+
+from opentelemetry import propagate, trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import Counter, Histogram
+
+tracer = trace.get_tracer("chatbot")
+
+STAGE_LATENCY = Histogram(
+    "chatbot_stage_duration_seconds",
+    "Time spent in each stage of a /chat turn",
+    ["stage"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+TODO_API_LATENCY = Histogram(
+    "chatbot_todo_api_duration_seconds",
+    "Latency of calls from the chatbot to the todo backend",
+    ["method"],
+)
+LLM_TOKENS = Counter(
+    "chatbot_llm_tokens_total",
+    "LLM tokens used, by call site and direction",
+    ["stage", "kind"],
+)
+CACHE_REQUESTS = Counter(
+    "chatbot_cache_requests_total",
+    "Cache lookups by cache and outcome (hit/miss)",
+    ["cache", "result"],
+)
+INTENT_PATHS = Counter(
+    "chatbot_intent_parse_total",
+    "Intent parses by path (structured, repaired, clarify)",
+    ["path"],
+)
+RESPONSE_PATHS = Counter(
+    "chatbot_responses_total",
+    "Chat replies by how they were produced (template, llm)",
+    ["path"],
+)
+
+
+def setup_tracing(service_name="chatbot"):
+    """Install the tracer provider; spans are exported over OTLP/HTTP when
+    OTEL_EXPORTER_OTLP_ENDPOINT points at a collector (e.g. http://localhost:4318)"""
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+@contextmanager
+def stage(name, histogram=STAGE_LATENCY, **labels):
+    """Span plus latency histogram around one stage"""
+    started = time.perf_counter()
+    with tracer.start_as_current_span(name) as span:
+        try:
+            yield span
+        finally:
+            histogram.labels(**(labels or {"stage": name})).observe(time.perf_counter() - started)
+
+
+def inject_trace_headers(headers):
+    # W3C traceparent so the backend's spans join the chat turn's trace
+    propagate.inject(headers)
+    return headers
+
+
+def record_llm_usage(stage_name, message):
+    usage = getattr(message, "usage_metadata", None) or {}
+    for kind in ("input_tokens", "output_tokens"):
+        if usage.get(kind):
+            LLM_TOKENS.labels(stage=stage_name, kind=kind.split("_")[0]).inc(usage[kind])
@@ -1,43 +1,128 @@
 import requests
 import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from utils.telemetry import CACHE_REQUESTS, TODO_API_LATENCY, inject_trace_headers, stage
+
+TODO_FIELDS = ('id', 'title', 'description', 'status', 'dependency', 'due_date')
+
+def traced(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with stage(f"todo_api.{method.__name__}", TODO_API_LATENCY, method=method.__name__):
+            return method(*args, **kwargs)
+    
+    return wrapper
 
 class TodoApiClient:
-    def __init__(self):
+    def __init__(self, max_cached_lists=256):
         self.base_url = os.getenv('TODO_API_URL', 'http://127.0.0.1:8000/api')
         self.session = requests.Session()
+        # token -> (cursor, {todo_id: todo}); kept in sync through the change feed
+        self._todo_cache = OrderedDict()
+        # Request threads share the cache; the lock covers the dict operations
+        # only, so one user's sync doesn't block everyone else's
+        self._todo_cache_lock = threading.Lock()
+        self.max_cached_lists = max_cached_lists
+    
+    def _headers(self, token):
+        return inject_trace_headers({"Authorization": f"Bearer {token}"})
     
     def _handle_response(self, response):
         response.raise_for_status()
         return response.json()
     
+    @traced
+    def get_todo_changes(self, since, token):
+        url = f"{self.base_url}/todos/changes/"
+        headers = self._headers(token)
+        return self._handle_response(self.session.get(url, params={"since": since}, headers=headers))
+    
+    @traced
     def get_todos(self, token):
-        url = f"{self.base_url}/todos/"
-        headers = {"Authorization": f"Bearer {token}"}
-        return self._handle_response(self.session.get(url, headers=headers))
+        with self._todo_cache_lock:
+            cursor, cached = self._todo_cache.get(token, (0, {}))
+        CACHE_REQUESTS.labels(cache="todo_list", result="hit" if cursor else "miss").inc()
+        todos = dict(cached)
+        
+        while True:
+            try:
+                page = self.get_todo_changes(cursor, token)
+            except requests.HTTPError as e:
+                # 410: tombstones past our cursor were purged, start over
+                if e.response is None or e.response.status_code != 410 or not cursor:
+                    raise
+                cursor, todos = 0, {}
+                continue
+            for change in page["changes"]:
+                if change["deleted"]:
+                    todos.pop(change["id"], None)
+                else:
+                    todos[change["id"]] = {field: change[field] for field in TODO_FIELDS}
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        
+        with self._todo_cache_lock:
+            self._todo_cache[token] = (cursor, todos)
+            self._todo_cache.move_to_end(token)
+            while len(self._todo_cache) > self.max_cached_lists:
+                self._todo_cache.popitem(last=False)
+        
+        return {"todo": [todos[todo_id] for todo_id in sorted(todos)]}
     
+    @traced
     def get_todo_by_id(self, todo_id, token):
         url = f"{self.base_url}/todo/{todo_id}/"
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = self._headers(token)
         return self._handle_response(self.session.get(url, headers=headers))
     
+    @traced
     def get_todo_by_title(self, title, token):
         url = f"{self.base_url}/todo/title/{title}/"
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = self._headers(token)
+        return self._handle_response(self.session.get(url, headers=headers))
+    
+    @traced
+    def search_todos(self, query, token, limit=5, match_all=False, statuses=None):
+        url = f"{self.base_url}/todos/search/"
+        headers = self._headers(token)
+        params = {"q": query, "limit": limit}
+        if match_all:
+            params["match"] = "all"
+        if statuses:
+            params["status"] = ",".join(statuses)
+        return self._handle_response(self.session.get(url, params=params, headers=headers))
+    
+    @traced
+    def get_overdue_summary(self, token):
+        url = f"{self.base_url}/todos/overdue/"
+        headers = self._headers(token)
+        return self._handle_response(self.session.get(url, headers=headers))
+    
+    @traced
+    def get_stats(self, token):
+        url = f"{self.base_url}/todos/stats/"
+        headers = self._headers(token)
         return self._handle_response(self.session.get(url, headers=headers))
     
+    @traced
     def create_todo(self, todo_data, token):
         url = f"{self.base_url}/todo/"
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = self._headers(token)
         return self._handle_response(self.session.post(url, json=todo_data, headers=headers))
     
+    @traced
     def update_todo(self, todo_id, todo_data, token):
         url = f"{self.base_url}/todo/{todo_id}/"
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = self._headers(token)
         return self._handle_response(self.session.put(url, json=todo_data, headers=headers))
     
+    @traced
     def delete_todo(self, todo_id, token):
         url = f"{self.base_url}/todo/{todo_id}/"
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = self._headers(token)
         response = self.session.delete(url, headers=headers)
         response.raise_for_status()
         return {"status": "deleted", "id": todo_id}
\ No newline at end of file
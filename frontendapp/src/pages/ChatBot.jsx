@@ -8,7 +8,6 @@ const ChatbotComponent = () => {
   const [newMessage, setNewMessage] = useState('');
   const [isTyping, setIsTyping] = useState(false);
   const messagesEndRef = useRef(null);
-  const shouldRefreshRef = useRef(false);
 
   useEffect(() => {
     const savedMessages = localStorage.getItem('chatMessages');
@@ -31,19 +30,10 @@ const ChatbotComponent = () => {
   }, []);
 
   useEffect(() => {
+    // The todo board picks up changes made through the chat from the
+    // /ws/todos/ socket, so there is no need to reload the page here.
     if (messages.length > 0) {
       localStorage.setItem('chatMessages', JSON.stringify(messages));
-      
-      const lastMessage = messages[messages.length - 1];
-      if (lastMessage?.sender === 'bot' && shouldRefreshRef.current) {
-        shouldRefreshRef.current = false;
-        
-        localStorage.setItem('chatbotOpen', 'true');
-        
-        setTimeout(() => {
-          window.location.reload();
-        }, 1000);
-      }
     }
   }, [messages]);
 
@@ -73,18 +63,7 @@ const ChatbotComponent = () => {
         }
       );
 
-      const responseText = response.data.response;
-      const isActionCommand = 
-        responseText.includes("created") || 
-        responseText.includes("updated") || 
-        responseText.includes("deleted") || 
-        responseText.includes("marked");
-      
-      if (isActionCommand) {
-        shouldRefreshRef.current = true;
-      }
-      
-      return responseText;
+      return response.data.response;
     } catch (error) {
       console.error('Error sending message to AI:', error);
       
@@ -1,37 +1,149 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
-import { authenticatedFetch } from '../utils/auth';
+import Cookies from 'js-cookie';
+import { authenticatedFetch, logout } from '../utils/auth';
+
+const BOARD_EVENTS = ['todo.created', 'todo.updated', 'todo.deleted'];
+const MAX_RECONNECT_DELAY = 30000;
+
+// Applies change feed entries and socket events to the board. Each todo keeps
+// the sequence of the write it reflects, so an older change arriving late
+// (an event during a resync, or the other way round) never undoes a newer one.
+const applyChanges = (todos, changes, removed) => {
+  const byId = new Map(todos.map(todo => [todo.id, todo]));
+
+  changes.forEach(change => {
+    const current = byId.get(change.id);
+    if (current && current.sequence >= change.sequence) return;
+    if ((removed.get(change.id) || 0) >= change.sequence) return;
+
+    if (change.deleted) {
+      byId.delete(change.id);
+      removed.set(change.id, change.sequence);
+    } else {
+      byId.set(change.id, change);
+    }
+  });
+
+  return [...byId.values()];
+};
 
 const TodoBoard = () => {
   const [todos, setTodos] = useState([]);
   const [loading, setLoading] = useState(true);
-  
+  const cursorRef = useRef(0);
+  const removedRef = useRef(new Map());
+
   useEffect(() => {
-    const fetchTodos = async () => {
-      try {
-        const response = await authenticatedFetch('/api/todos/');
-        if (response.ok) {
-          const data = await response.json();
-          
-          if (data && Array.isArray(data.todo)) {
-            setTodos(data.todo);
-          } else {
-            console.error('Unexpected data format:', data);
-            setTodos([]);
-          }
-        } else {
-          console.error('Failed to fetch todos');
-          setTodos([]);
+    const token = Cookies.get('token');
+    if (!token) {
+      logout();
+      return;
+    }
+
+    let socket = null;
+    let reconnectTimer = null;
+    let attempts = 0;
+    let closed = false;
+
+    // Catches up from the last change feed cursor. A full sync (cursor 0)
+    // also drops todos that no longer exist, unless an event newer than the
+    // snapshot put them there.
+    const syncChanges = async () => {
+      let since = cursorRef.current;
+
+      while (true) {
+        const response = await authenticatedFetch(`/api/todos/changes/?since=${since}`);
+        if (response.status === 410) {
+          // Tombstones past our cursor were purged
+          since = 0;
+          continue;
         }
-      } catch (error) {
-        console.error('Error fetching todos:', error);
-        setTodos([]);
-      } finally {
-        setLoading(false);
+        if (!response.ok) {
+          throw new Error(`Change feed returned ${response.status}`);
+        }
+
+        const page = await response.json();
+        const fullSync = since === 0;
+
+        setTodos(current => {
+          const merged = applyChanges(current, page.changes, removedRef.current);
+          if (!fullSync) return merged;
+
+          const live = new Set(page.changes.map(change => change.id));
+          return merged.filter(todo => live.has(todo.id) || todo.sequence > page.cursor);
+        });
+
+        since = page.cursor;
+        if (!page.has_more) break;
       }
+
+      cursorRef.current = since;
+    };
+
+    const connect = () => {
+      const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+      socket = new WebSocket(`${protocol}://${window.location.host}/ws/todos/`);
+
+      // The token goes in the first message, not the URL, so it stays out of access logs
+      socket.onopen = () => socket.send(JSON.stringify({ type: 'auth', token }));
+
+      socket.onmessage = async (message) => {
+        const event = JSON.parse(message.data);
+
+        // auth.ok: subscribed, so nothing written from here on is missed.
+        // todo.resync: the server dropped events for this connection.
+        if (event.type === 'auth.ok' || event.type === 'todo.resync') {
+          try {
+            await syncChanges();
+            attempts = 0;
+          } catch (error) {
+            console.error('Error syncing todos:', error);
+            socket.close();
+          } finally {
+            setLoading(false);
+          }
+          return;
+        }
+
+        // The same stream carries other events (e.g. todo.reminder) that
+        // have no todo payload for the board
+        if (!BOARD_EVENTS.includes(event.type)) return;
+
+        const change = {
+          ...event.todo,
+          id: event.id,
+          sequence: event.sequence,
+          deleted: event.type === 'todo.deleted',
+        };
+        setTodos(current => applyChanges(current, [change], removedRef.current));
+      };
+
+      socket.onclose = (event) => {
+        if (closed) return;
+        if (event.code === 4401) {
+          logout();
+          return;
+        }
+
+        // Keep the board current over plain HTTP while the socket is down
+        syncChanges()
+          .catch(error => console.error('Error syncing todos:', error))
+          .finally(() => setLoading(false));
+
+        const delay = Math.min(MAX_RECONNECT_DELAY, 1000 * 2 ** attempts);
+        attempts += 1;
+        reconnectTimer = setTimeout(connect, delay);
+      };
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (socket) socket.close();
     };
-    
-    fetchTodos();
   }, []);
   
   const sortByDueDate = (a, b) => {